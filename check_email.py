@@ -2,14 +2,13 @@
 import asyncio
 import os
 import logging
-from ipo_reminder.emailer import Emailer
-from ipo_reminder.config import check_email_config
+from collections import deque
+from ipo_reminder.emailer import send_email_async
+from ipo_reminder.config import LOG_FILE, LOG_FORMAT, check_email_config
+from ipo_reminder.logging_config import flush_queued_logs, setup_logging
 
 # Enable debug logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+setup_logging(log_level="DEBUG", log_file=LOG_FILE, log_format=LOG_FORMAT)
 logger = logging.getLogger(__name__)
 
 async def test_email():
@@ -22,9 +21,6 @@ async def test_email():
         logger.error(f"❌ Email configuration error: {e}")
         return False
 
-    # Initialize emailer
-    emailer = Emailer()
-    
     # Test email content
     subject = "📈 IPO Reminder - Test Email"
     html_content = """
@@ -35,18 +31,21 @@ async def test_email():
     
     try:
         logger.info("Sending test email...")
-        result = await emailer.send_email(
+        recipient = os.getenv("RECIPIENT_EMAIL")
+        result = await send_email_async(
             subject=subject,
-            html_content=html_content,
-            recipient_email=os.getenv("RECIPIENT_EMAIL"),
-            sender_name="IPO Reminder Test"
+            body="This email contains HTML content. Please view in HTML mode.",
+            html_body=html_content,
+            recipients=[recipient] if recipient else None
         )
         if result:
             logger.info("✅ Test email sent successfully!")
-            # Check the email log
+            # Check the email log once the background writer has caught up
+            flush_queued_logs()
             if os.path.exists("logs/email.log"):
-                with open("logs/email.log", "r") as f:
-                    last_entry = f.readlines()[-1] if f.readlines() else "No entries"
+                with open("logs/email.log", "r", encoding="utf-8") as f:
+                    tail = deque(f, maxlen=1)
+                last_entry = tail[0].rstrip() if tail else "No entries"
                 logger.info(f"📧 Last email log entry: {last_entry}")
             return True
         else:
@@ -9,8 +9,11 @@ import sys
 import asyncio
 from pathlib import Path
 
+# Project root, computed once; holds the .env file
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
 # Add the parent directory to Python path so absolute imports work
-sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(PROJECT_ROOT))
 
 async def run_enterprise_system():
     """Run the enterprise IPO reminder system."""
@@ -71,8 +74,8 @@ if __name__ == "__main__":
     print()
 
     # Load environment variables if .env exists
-    env_file = Path("../.env")
-    if env_file.exists():
+    env_file = str(PROJECT_ROOT / ".env")
+    if os.path.exists(env_file):
         try:
             from dotenv import load_dotenv
             load_dotenv(dotenv_path=env_file)
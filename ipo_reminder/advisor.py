@@ -1,17 +1,120 @@
 """Personal IPO Investment Advisor - Intelligent recommendation engine."""
+import heapq
 import logging
 import re
 from datetime import datetime, date
-from typing import List, Dict, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, ClassVar, List, Dict, FrozenSet, Mapping, Optional, Pattern, Set, Tuple
 from dataclasses import dataclass
 
 from .sources.chittorgarh import IPOInfo
 
 logger = logging.getLogger(__name__)
 
+# Keywords used to identify a company's sector from its name
+SECTOR_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    'technology': ('tech', 'software', 'digital', 'ai', 'data', 'cyber', 'cloud'),
+    'fintech': ('fintech', 'financial tech', 'payments', 'digital banking'),
+    'healthcare': ('health', 'medical', 'hospital', 'pharmaceutical', 'biotech'),
+    'pharmaceuticals': ('pharma', 'pharmaceutical', 'drug', 'medicine'),
+    'renewable energy': ('solar', 'wind', 'renewable', 'green energy', 'clean energy'),
+    'electric vehicles': ('electric', 'ev', 'battery', 'automotive'),
+    'infrastructure': ('infrastructure', 'construction', 'engineering', 'roads'),
+    'banking': ('bank', 'banking', 'financial services'),
+    'insurance': ('insurance', 'life insurance', 'general insurance'),
+    'consumer goods': ('consumer', 'retail', 'fmcg', 'food', 'beverage'),
+    'tobacco': ('tobacco', 'cigarette', 'smoking'),
+    'alcohol': ('alcohol', 'beer', 'liquor', 'brewery'),
+    'gambling': ('gaming', 'casino', 'betting'),
+    'mining': ('mining', 'coal', 'mineral', 'extraction'),
+    'coal': ('coal', 'thermal'),
+}
+
+TECH_BONUS_KEYWORDS: Tuple[str, ...] = ('tech', 'digital', 'software', 'fintech', 'ai', 'data')
+
+
+# Label used in the keyword scan for the technology growth bonus
+TECH_BONUS = 'tech bonus'
+
+
+def _build_keyword_labels() -> Dict[str, FrozenSet[str]]:
+    """Map each keyword to every label it implies, including labels of its prefixes.
+
+    The scanner reports only the longest keyword starting at each position, so
+    a match also has to imply any shorter keyword it begins with (e.g. finding
+    'pharmaceutical' also means 'pharma' occurs there).
+    """
+    labels: Dict[str, Set[str]] = {}
+    for sector, keywords in SECTOR_KEYWORDS.items():
+        for keyword in keywords:
+            labels.setdefault(keyword, set()).add(sector)
+    for keyword in TECH_BONUS_KEYWORDS:
+        labels.setdefault(keyword, set()).add(TECH_BONUS)
+
+    return {
+        keyword: frozenset().union(*(labels[other] for other in labels if keyword.startswith(other)))
+        for keyword in labels
+    }
+
+
+# Precompiled patterns so the per-IPO analysis never rebuilds or recompiles them
+_SIZE_RE = re.compile(r'([\d,]+)')
+_PRICE_RE = re.compile(r'₹?\s*(\d+)[-–]\s*₹?\s*(\d+)')
+
+# One automaton over every sector and bonus keyword. The zero-width lookahead
+# visits each position of the name once and captures the longest keyword that
+# starts there, so a single finditer() pass finds every keyword occurrence.
+_KEYWORD_LABELS = _build_keyword_labels()
+SECTOR_SCANNER: Pattern = re.compile(
+    "(?=(" + "|".join(map(re.escape, sorted(_KEYWORD_LABELS, key=len, reverse=True))) + "))"
+)
+
+
+def match_sectors(name_lower: str) -> FrozenSet[str]:
+    """Return every sector label (and TECH_BONUS) whose keywords occur in the name."""
+    return frozenset().union(
+        *(_KEYWORD_LABELS[match.group(1)] for match in SECTOR_SCANNER.finditer(name_lower))
+    )
+
+
+def _has_sector(sector: str, name_lower: str, matched: FrozenSet[str]) -> bool:
+    """Check a sector against the scan result, falling back to its own name if unmapped."""
+    if sector in SECTOR_KEYWORDS:
+        return sector in matched
+    return sector in name_lower
+
+
+# Ranking of recommendation labels, strongest first
+RECOMMENDATION_ORDER: Dict[str, int] = {
+    'STRONG BUY': 5,
+    'BUY': 4,
+    'APPLY': 3,
+    'NEUTRAL': 2,
+    'AVOID': 1
+}
+
+# Minimum overall score for each recommendation label
+RECOMMENDATION_THRESHOLDS: Dict[str, float] = {
+    'STRONG BUY': 0.8,
+    'BUY': 0.65,
+    'APPLY': 0.5,
+    'NEUTRAL': 0.3,
+    'AVOID': 0.0
+}
+
+# Highest score the issue size, price band and platform analyses can award
+_MAX_FACTOR_SCORE = 0.8
+
+
 @dataclass
 class IPORecommendation:
     """IPO recommendation with detailed analysis."""
+    # Declared by hand because dataclass(slots=True) needs Python 3.10
+    __slots__ = (
+        'ipo', 'recommendation', 'confidence', 'reasoning',
+        'risk_level', 'investment_amount', 'key_factors'
+    )
+
     ipo: IPOInfo
     recommendation: str  # STRONG BUY, BUY, APPLY, NEUTRAL, AVOID
     confidence: float    # 0.0 to 1.0
@@ -23,73 +126,83 @@ class IPORecommendation:
 class PersonalIPOAdvisor:
     """Intelligent IPO advisor for personal investment decisions."""
     
-    def __init__(self):
-        # Personal investment criteria - customize these for Dinesh
-        self.criteria = {
-            'preferred_sectors': [
-                'technology', 'fintech', 'healthcare', 'pharmaceuticals',
-                'renewable energy', 'electric vehicles', 'infrastructure',
-                'banking', 'insurance', 'consumer goods'
-            ],
-            'avoid_sectors': [
-                'tobacco', 'alcohol', 'gambling', 'mining', 'coal'
-            ],
-            'min_issue_size_cr': 50,  # Minimum issue size in crores
-            'max_issue_size_cr': 5000,  # Maximum for risk management
-            'preferred_price_range': (100, 2000),  # Price band preference
-            'risk_tolerance': 'MEDIUM',  # LOW, MEDIUM, HIGH
-            'investment_horizon': 'LONG_TERM',  # SHORT_TERM, MEDIUM_TERM, LONG_TERM
-            'max_investment_per_ipo': 50000  # Maximum investment amount
-        }
-        
-    def analyze_ipo(self, ipo: IPOInfo) -> IPORecommendation:
-        """Provide personalized IPO recommendation."""
+    # Personal investment criteria - customize these for Dinesh. Shared and
+    # read-only, so one advisor can be reused across batches and threads.
+    CRITERIA: ClassVar[Mapping[str, Any]] = MappingProxyType({
+        # Tuples keep the priority order used when picking the reported sector
+        'preferred_sectors': (
+            'technology', 'fintech', 'healthcare', 'pharmaceuticals',
+            'renewable energy', 'electric vehicles', 'infrastructure',
+            'banking', 'insurance', 'consumer goods'
+        ),
+        'avoid_sectors': (
+            'tobacco', 'alcohol', 'gambling', 'mining', 'coal'
+        ),
+        'min_issue_size_cr': 50,  # Minimum issue size in crores
+        'max_issue_size_cr': 5000,  # Maximum for risk management
+        'preferred_price_range': (100, 2000),  # Price band preference
+        'risk_tolerance': 'MEDIUM',  # LOW, MEDIUM, HIGH
+        'investment_horizon': 'LONG_TERM',  # SHORT_TERM, MEDIUM_TERM, LONG_TERM
+        'max_investment_per_ipo': 50000  # Maximum investment amount
+    })
+
+    def analyze_ipo(
+        self, ipo: IPOInfo, min_recommendation: Optional[str] = None
+    ) -> Optional[IPORecommendation]:
+        """Provide personalized IPO recommendation.
+
+        When ``min_recommendation`` is given, returns None for IPOs that rank
+        below it. If the sector score alone rules that level out, the size,
+        price and platform analyses are skipped.
+        """
         logger.info(f"Analyzing IPO: {ipo.name}")
         
-        recommendation = "NEUTRAL"
-        confidence = 0.5
-        reasoning = []
-        risk_level = "MEDIUM"
-        investment_amount = "₹10,000-25,000"
-        key_factors = {}
-        
         # Analyze company name and sector
         sector_score, sector_reasoning = self._analyze_sector(ipo.name)
-        reasoning.extend(sector_reasoning)
-        
+
+        if min_recommendation is not None:
+            # Same weighting as the overall score with every other factor at its best
+            best_case_score = (sector_score * 0.4 + _MAX_FACTOR_SCORE * 0.2 +
+                               _MAX_FACTOR_SCORE * 0.2 + _MAX_FACTOR_SCORE * 0.2)
+            if best_case_score < RECOMMENDATION_THRESHOLDS[min_recommendation]:
+                return None
+
         # Analyze issue size
         size_score, size_reasoning = self._analyze_issue_size(ipo.issue_size)
-        reasoning.extend(size_reasoning)
-        
+
         # Analyze price band
         price_score, price_reasoning = self._analyze_price_band(ipo.price_band)
-        reasoning.extend(price_reasoning)
-        
+
         # Analyze platform (Mainboard vs SME)
         platform_score, platform_reasoning = self._analyze_platform(ipo.name)
-        reasoning.extend(platform_reasoning)
-        
+
+        reasoning = sector_reasoning + size_reasoning + price_reasoning + platform_reasoning
+
         # Calculate overall score
         overall_score = (sector_score * 0.4 + size_score * 0.2 + 
                         price_score * 0.2 + platform_score * 0.2)
+
+        if (min_recommendation is not None
+                and overall_score < RECOMMENDATION_THRESHOLDS[min_recommendation]):
+            return None
         
         # Determine recommendation
-        if overall_score >= 0.8:
+        if overall_score >= RECOMMENDATION_THRESHOLDS['STRONG BUY']:
             recommendation = "STRONG BUY"
             confidence = min(0.95, overall_score)
             investment_amount = "₹25,000-50,000"
             risk_level = "MEDIUM"
-        elif overall_score >= 0.65:
+        elif overall_score >= RECOMMENDATION_THRESHOLDS['BUY']:
             recommendation = "BUY"
             confidence = overall_score
             investment_amount = "₹15,000-30,000"
             risk_level = "MEDIUM"
-        elif overall_score >= 0.5:
+        elif overall_score >= RECOMMENDATION_THRESHOLDS['APPLY']:
             recommendation = "APPLY"
             confidence = overall_score
             investment_amount = "₹10,000-20,000"
             risk_level = "MEDIUM"
-        elif overall_score >= 0.3:
+        elif overall_score >= RECOMMENDATION_THRESHOLDS['NEUTRAL']:
             recommendation = "NEUTRAL"
             confidence = overall_score
             investment_amount = "₹5,000-10,000"
@@ -125,22 +238,25 @@ class PersonalIPOAdvisor:
         reasoning = []
         score = 0.5  # neutral baseline
         
+        # Single pass over the name finds every sector it mentions
+        matched = match_sectors(name_lower)
+
         # Check preferred sectors
-        for sector in self.criteria['preferred_sectors']:
-            if any(keyword in name_lower for keyword in self._get_sector_keywords(sector)):
+        for sector in self.CRITERIA['preferred_sectors']:
+            if _has_sector(sector, name_lower, matched):
                 score = 0.8
                 reasoning.append(f"✅ {sector.title()} sector aligns with your investment preferences")
                 break
         
         # Check sectors to avoid
-        for sector in self.criteria['avoid_sectors']:
-            if any(keyword in name_lower for keyword in self._get_sector_keywords(sector)):
+        for sector in self.CRITERIA['avoid_sectors']:
+            if _has_sector(sector, name_lower, matched):
                 score = 0.2
                 reasoning.append(f"❌ {sector.title()} sector - consider avoiding based on your criteria")
                 break
         
         # Special tech/fintech bonus
-        if any(word in name_lower for word in ['tech', 'digital', 'software', 'fintech', 'ai', 'data']):
+        if TECH_BONUS in matched:
             score = min(1.0, score + 0.2)
             reasoning.append("🚀 Technology company - strong growth potential")
         
@@ -149,27 +265,6 @@ class PersonalIPOAdvisor:
         
         return score, reasoning
     
-    def _get_sector_keywords(self, sector: str) -> List[str]:
-        """Get keywords for sector identification."""
-        keyword_map = {
-            'technology': ['tech', 'software', 'digital', 'ai', 'data', 'cyber', 'cloud'],
-            'fintech': ['fintech', 'financial tech', 'payments', 'digital banking'],
-            'healthcare': ['health', 'medical', 'hospital', 'pharmaceutical', 'biotech'],
-            'pharmaceuticals': ['pharma', 'pharmaceutical', 'drug', 'medicine'],
-            'renewable energy': ['solar', 'wind', 'renewable', 'green energy', 'clean energy'],
-            'electric vehicles': ['electric', 'ev', 'battery', 'automotive'],
-            'infrastructure': ['infrastructure', 'construction', 'engineering', 'roads'],
-            'banking': ['bank', 'banking', 'financial services'],
-            'insurance': ['insurance', 'life insurance', 'general insurance'],
-            'consumer goods': ['consumer', 'retail', 'fmcg', 'food', 'beverage'],
-            'tobacco': ['tobacco', 'cigarette', 'smoking'],
-            'alcohol': ['alcohol', 'beer', 'liquor', 'brewery'],
-            'gambling': ['gaming', 'casino', 'betting'],
-            'mining': ['mining', 'coal', 'mineral', 'extraction'],
-            'coal': ['coal', 'thermal']
-        }
-        return keyword_map.get(sector, [sector])
-    
     def _analyze_issue_size(self, issue_size: str) -> Tuple[float, List[str]]:
         """Analyze issue size appropriateness."""
         if not issue_size:
@@ -179,7 +274,7 @@ class PersonalIPOAdvisor:
         score = 0.5
         
         # Extract number from issue size
-        size_match = re.search(r'([\d,]+)', issue_size.replace('₹', '').replace(',', ''))
+        size_match = _SIZE_RE.search(issue_size.replace('₹', '').replace(',', ''))
         if size_match:
             try:
                 size_cr = float(size_match.group(1))
@@ -187,10 +282,10 @@ class PersonalIPOAdvisor:
                 if 'lakh' in issue_size.lower():
                     size_cr = size_cr / 100  # Convert lakhs to crores
                 
-                if self.criteria['min_issue_size_cr'] <= size_cr <= self.criteria['max_issue_size_cr']:
+                if self.CRITERIA['min_issue_size_cr'] <= size_cr <= self.CRITERIA['max_issue_size_cr']:
                     score = 0.8
                     reasoning.append(f"✅ Issue size ₹{size_cr:.0f} Cr is appropriate for your portfolio")
-                elif size_cr < self.criteria['min_issue_size_cr']:
+                elif size_cr < self.CRITERIA['min_issue_size_cr']:
                     score = 0.4
                     reasoning.append(f"⚠️ Small issue size ₹{size_cr:.0f} Cr - higher risk but potential upside")
                 else:
@@ -213,14 +308,14 @@ class PersonalIPOAdvisor:
         score = 0.5
         
         # Extract price range
-        price_match = re.search(r'₹?\s*(\d+)[-–]\s*₹?\s*(\d+)', price_band)
+        price_match = _PRICE_RE.search(price_band)
         if price_match:
             try:
                 min_price = int(price_match.group(1))
                 max_price = int(price_match.group(2))
                 avg_price = (min_price + max_price) / 2
                 
-                pref_min, pref_max = self.criteria['preferred_price_range']
+                pref_min, pref_max = self.CRITERIA['preferred_price_range']
                 
                 if pref_min <= avg_price <= pref_max:
                     score = 0.8
@@ -254,27 +349,32 @@ class PersonalIPOAdvisor:
         
         return score, reasoning
 
-def get_personalized_recommendations(ipos: List[IPOInfo]) -> List[IPORecommendation]:
-    """Get personalized IPO recommendations for Dinesh."""
-    advisor = PersonalIPOAdvisor()
+# The advisor holds no per-call state, so a single instance serves every batch
+_default_advisor = PersonalIPOAdvisor()
+
+def get_personalized_recommendations(
+    ipos: List[IPOInfo],
+    top_k: Optional[int] = None,
+    min_recommendation: Optional[str] = None,
+) -> List[IPORecommendation]:
+    """Get personalized IPO recommendations for Dinesh, strongest first.
+
+    When ``top_k`` is given only the best ``top_k`` recommendations are
+    returned, selected with a heap instead of sorting the whole list. When
+    ``min_recommendation`` is given (e.g. ``"BUY"``), IPOs ranked below it are
+    dropped, and hopeless ones are screened out after the sector check.
+    """
     recommendations = []
-    
     for ipo in ipos:
-        recommendation = advisor.analyze_ipo(ipo)
-        recommendations.append(recommendation)
-    
-    # Sort by recommendation strength
-    recommendation_order = {
-        'STRONG BUY': 5,
-        'BUY': 4,
-        'APPLY': 3,
-        'NEUTRAL': 2,
-        'AVOID': 1
-    }
-    
-    recommendations.sort(key=lambda x: (
-        recommendation_order.get(x.recommendation, 0),
-        x.confidence
-    ), reverse=True)
-    
+        recommendation = _default_advisor.analyze_ipo(ipo, min_recommendation)
+        if recommendation is not None:
+            recommendations.append(recommendation)
+
+    def sort_key(rec: IPORecommendation) -> Tuple[int, float]:
+        return RECOMMENDATION_ORDER.get(rec.recommendation, 0), rec.confidence
+
+    if top_k is not None:
+        return heapq.nlargest(top_k, recommendations, key=sort_key)
+
+    recommendations.sort(key=sort_key, reverse=True)
     return recommendations
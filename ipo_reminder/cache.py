@@ -1,21 +1,172 @@
 """Enterprise-grade caching layer with Redis and in-memory fallbacks."""
-import json
+import copy
+import dataclasses
+import heapq
 import logging
-import pickle
-from datetime import datetime, timedelta
-from typing import Any, Optional, Dict, List
+import queue
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Optional, Dict, List, Set, Tuple
 from functools import wraps
+import msgpack
+import orjson
 import redis
-import hashlib
+
+from ipo_reminder.config import CACHE_MEMORY_MAX_ENTRIES, CACHE_MEMORY_MAX_BYTES
 
 logger = logging.getLogger(__name__)
 
+# Redis connection pool: threads (e.g. the write-behind writer) wait up to
+# REDIS_POOL_TIMEOUT seconds for a free connection; a hung server fails
+# after REDIS_SOCKET_TIMEOUT so callers fall back to the memory cache
+REDIS_MAX_CONNECTIONS = 16
+REDIS_POOL_TIMEOUT = 5
+REDIS_SOCKET_TIMEOUT = 1.0
+REDIS_HEALTH_CHECK_INTERVAL = 30
+
+# Index members read per SSCAN (and unlinked per pipeline) when clearing a namespace
+CLEAR_BATCH_SIZE = 1000
+# Redis set recording the cache keys stored under each namespace
+NAMESPACE_INDEX_PREFIX = "ns_index:"
+# Writes flushed per pipeline by the write-behind thread
+WRITE_BEHIND_BATCH_SIZE = 500
+# Results each @cached function keeps in its in-process memo, and how long
+# one is reused. Writes by other processes (or straight to Redis) are not
+# seen by the memo, so this bounds how stale a memoized result can get.
+MEMO_MAX_ENTRIES = 1024
+MEMO_TTL_SECONDS = 30
+
+# In-process memos of @cached functions by namespace, emptied by clear_namespace;
+# entries are (cache key, result, expiry)
+_namespace_memos: Dict[str, List["OrderedDict[Any, Tuple[str, Any, float]]"]] = {}
+# Guards every memo. @cached functions are plain synchronous callables, so
+# nothing stops a caller running them on worker threads; CacheManager's
+# memory cache is locked for the same reason.
+_memo_lock = threading.Lock()
+
+# Arguments memoized by value; any other argument (e.g. self) is held by weak
+# reference so the memo never keeps it alive
+_MEMO_VALUE_TYPES = (str, int, float, bool, bytes, type(None), date, datetime, Enum)
+
+def _memo_arg(value: Any) -> Any:
+    """Memo key part for one argument; TypeError if it can't be memoized."""
+    if isinstance(value, _MEMO_VALUE_TYPES):
+        return value
+    return weakref.ref(value)
+
+def _copy_result(value: Any) -> Any:
+    """
+    Copy a memoized result so callers can't mutate the memo's instance.
+
+    Lists, dicts, sets and dataclass instances are copied recursively; other
+    values (strings, numbers, dates, ...) are immutable and shared.
+    """
+    if isinstance(value, list):
+        return [_copy_result(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy_result(item) for key, item in value.items()}
+    if isinstance(value, set):
+        return {_copy_result(item) for item in value}
+    if type(value) is tuple:
+        return tuple(_copy_result(item) for item in value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        clone = copy.copy(value)
+        for field in dataclasses.fields(value):
+            # object.__setattr__ also works on frozen dataclasses
+            object.__setattr__(clone, field.name, _copy_result(getattr(value, field.name)))
+        return clone
+    return value
+
+# One-byte tags prepended to stored values so reads dispatch without try/except
+MSGPACK_TAG = b'M'
+JSON_TAG = b'J'
+
+# msgpack extension type codes for values that must come back as the same type
+EXT_DATE = 1
+EXT_DATETIME = 2
+EXT_DATACLASS = 3
+
+# Dataclasses rebuilt on read, by qualified name (see register_cache_type)
+_cache_types: Dict[str, type] = {}
+
+def _type_name(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+def register_cache_type(cls: type) -> type:
+    """Class decorator: cached instances of this dataclass are read back as instances.
+
+    Other dataclasses are stored as plain dicts. Only registered classes are
+    ever constructed from cache data.
+    """
+    if not dataclasses.is_dataclass(cls):
+        raise TypeError(f"{cls.__name__} is not a dataclass")
+    _cache_types[_type_name(cls)] = cls
+    return cls
+
+def _msgpack_default(obj: Any) -> Any:
+    """Convert types msgpack cannot pack natively into packable equivalents."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        name = _type_name(type(obj))
+        if name in _cache_types:
+            fields = {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj) if f.init}
+            return msgpack.ExtType(EXT_DATACLASS, _msgpack_pack([name, fields]))
+        to_dict = getattr(obj, 'to_dict', None)
+        return to_dict() if callable(to_dict) else dataclasses.asdict(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    # Timezone-aware datetimes are packed natively as msgpack timestamps
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(EXT_DATETIME, obj.isoformat().encode())
+    if isinstance(obj, date):
+        return msgpack.ExtType(EXT_DATE, obj.isoformat().encode())
+    raise TypeError(f"Cannot serialize {type(obj).__name__} with msgpack")
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    """Rebuild the values packed as extension types by _msgpack_default."""
+    if code == EXT_DATE:
+        return date.fromisoformat(data.decode())
+    if code == EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == EXT_DATACLASS:
+        name, fields = _msgpack_unpack(data)
+        cls = _cache_types.get(name)
+        # A class no longer registered (e.g. renamed) reads back as its fields
+        return cls(**fields) if cls is not None else fields
+    return msgpack.ExtType(code, data)
+
+def _msgpack_pack(value: Any) -> bytes:
+    return msgpack.packb(value, use_bin_type=True, datetime=True, default=_msgpack_default)
+
+def _msgpack_unpack(payload: bytes) -> Any:
+    return msgpack.unpackb(payload, raw=False, timestamp=3, ext_hook=_msgpack_ext_hook)
+
 class CacheManager:
     """Enterprise-grade caching with Redis and memory fallbacks."""
 
-    def __init__(self, redis_url: str = "redis://localhost:6379/0"):
+    def __init__(self, redis_url: str = "redis://localhost:6379/0",
+                 max_entries: int = CACHE_MEMORY_MAX_ENTRIES,
+                 max_bytes: int = CACHE_MEMORY_MAX_BYTES):
         self.redis_client = None
-        self.memory_cache: Dict[str, Dict[str, Any]] = {}
+        # LRU order: cache_key -> (value, expires_at monotonic, serialized size, namespace)
+        self.memory_cache: "OrderedDict[str, Tuple[Any, float, int, str]]" = OrderedDict()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.memory_bytes = 0
+        # (expires_at, cache_key) min-heap; records for replaced or removed
+        # entries are skipped lazily and compacted away when they pile up
+        self._expiry_heap: List[Tuple[float, str]] = []
+        # Namespace members, so clearing one never scans the whole cache
+        self.namespace_keys: Dict[str, Set[str]] = {}
+        # Guards memory_cache, _expiry_heap, memory_bytes and namespace_keys
+        self._memory_lock = threading.RLock()
+        # Longest TTL written to each namespace, which its Redis index outlives
+        self._namespace_ttls: Dict[str, int] = {}
         self.cache_stats = {
             'hits': 0,
             'misses': 0,
@@ -23,9 +174,22 @@ class CacheManager:
             'deletes': 0,
             'errors': 0
         }
+        self._write_queue: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
 
         try:
-            self.redis_client = redis.from_url(redis_url, decode_responses=False)
+            pool = redis.BlockingConnectionPool.from_url(
+                redis_url,
+                max_connections=REDIS_MAX_CONNECTIONS,
+                timeout=REDIS_POOL_TIMEOUT,
+                socket_timeout=REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+                socket_keepalive=True,
+                health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+                decode_responses=False,
+            )
+            self.redis_client = redis.Redis(connection_pool=pool)
             self.redis_client.ping()
             logger.info("Redis cache initialized successfully")
         except Exception as e:
@@ -42,6 +206,8 @@ class CacheManager:
         try:
             if self.redis_client:
                 self.redis_client.close()
+                # close() leaves an explicitly passed pool open
+                self.redis_client.connection_pool.disconnect()
             logger.info("Cache manager shutdown complete")
         except Exception as e:
             logger.error(f"Error shutting down cache manager: {e}")
@@ -51,33 +217,125 @@ class CacheManager:
         return {
             'redis_connected': self.redis_client is not None,
             'memory_cache_size': len(self.memory_cache),
+            'memory_cache_bytes': self.memory_bytes,
             'stats': self.cache_stats.copy()
         }
 
     def _get_cache_key(self, key: str, namespace: str = "") -> str:
-        """Generate consistent cache key with optional namespace."""
+        """
+        Generate consistent cache key with optional namespace.
+
+        Keys are stored readable rather than hashed. The namespace is wrapped
+        in a Redis Cluster hash tag so a namespace's keys share one slot and
+        can be pipelined or MGET together.
+        """
+        if namespace:
+            return f"{{{namespace}}}:{key}"
+        return key
+
+    def _namespace_index(self, namespace: str) -> str:
+        """Redis key of the set indexing a namespace's cache keys (same hash slot)."""
+        return f"{NAMESPACE_INDEX_PREFIX}{{{namespace}}}"
+
+    def _queue_setex(self, pipe, cache_key: str, serialized: bytes, ttl_seconds: int, namespace: str) -> None:
+        """
+        Add a SETEX (and the namespace index SADD) to a Redis pipeline.
+
+        The index is given the longest TTL this process has written to the
+        namespace, renewed on every write, so it expires once its members
+        have and stale members cannot pile up between clear_namespace calls.
+        """
+        pipe.setex(cache_key, ttl_seconds, serialized)
         if namespace:
-            key = f"{namespace}:{key}"
-        return hashlib.md5(key.encode()).hexdigest()
+            index_ttl = max(ttl_seconds, self._namespace_ttls.get(namespace, 0))
+            self._namespace_ttls[namespace] = index_ttl
+            index_key = self._namespace_index(namespace)
+            pipe.sadd(index_key, cache_key)
+            pipe.expire(index_key, index_ttl)
+
+    def _remember(self, cache_key: str, value: Any, ttl_seconds: int, namespace: str, size: int) -> None:
+        """Store a value in the memory cache, evicting least recently used entries."""
+        now = time.monotonic()
+        with self._memory_lock:
+            self._forget(cache_key)
+            self.memory_cache[cache_key] = (value, now + ttl_seconds, size, namespace)
+            self.memory_bytes += size
+            if namespace:
+                self.namespace_keys.setdefault(namespace, set()).add(cache_key)
+
+            heapq.heappush(self._expiry_heap, (now + ttl_seconds, cache_key))
+            self._sweep_expired(now)
+
+            while self.memory_cache and (len(self.memory_cache) > self.max_entries
+                                         or self.memory_bytes > self.max_bytes):
+                self._forget(next(iter(self.memory_cache)))
+
+    def _sweep_expired(self, now: float) -> int:
+        """Drop expired memory entries in O(expired * log N) using the expiry heap."""
+        with self._memory_lock:
+            heap = self._expiry_heap
+            swept = 0
+            while heap and heap[0][0] <= now:
+                expires_at, cache_key = heapq.heappop(heap)
+                entry = self.memory_cache.get(cache_key)
+                # Only a record matching the live entry's expiry may remove it
+                if entry is not None and entry[1] == expires_at:
+                    self._forget(cache_key)
+                    swept += 1
+
+            if len(heap) > 2 * len(self.memory_cache):
+                self._expiry_heap = [(entry[1], key) for key, entry in self.memory_cache.items()]
+                heapq.heapify(self._expiry_heap)
+            return swept
+
+    def _recall(self, cache_key: str, now: float) -> Tuple[bool, Any]:
+        """Look up a live memory cache entry, marking it recently used."""
+        with self._memory_lock:
+            entry = self.memory_cache.get(cache_key)
+            if entry is None:
+                return False, None
+            if now >= entry[1]:
+                # Expired, remove it
+                self._forget(cache_key)
+                return False, None
+            self.memory_cache.move_to_end(cache_key)
+            return True, entry[0]
+
+    def _forget(self, cache_key: str) -> bool:
+        """Remove an entry from the memory cache, keeping size and namespace index in step."""
+        with self._memory_lock:
+            entry = self.memory_cache.pop(cache_key, None)
+            if entry is None:
+                return False
+            self.memory_bytes -= entry[2]
+            namespace_keys = self.namespace_keys.get(entry[3])
+            if namespace_keys is not None:
+                namespace_keys.discard(cache_key)
+            return True
 
     def _serialize_value(self, value: Any) -> bytes:
         """Serialize value for storage."""
         try:
-            return pickle.dumps(value)
+            return MSGPACK_TAG + _msgpack_pack(value)
         except Exception as e:
-            logger.warning(f"Pickle serialization failed, using JSON: {e}")
-            return json.dumps(value, default=str).encode('utf-8')
+            logger.warning(f"Msgpack serialization failed, using JSON: {e}")
+            return JSON_TAG + orjson.dumps(value, default=str)
 
     def _deserialize_value(self, value: bytes) -> Any:
         """Deserialize value from storage."""
+        tag, payload = value[:1], value[1:]
         try:
-            return pickle.loads(value)
-        except Exception:
-            try:
-                return json.loads(value.decode('utf-8'))
-            except Exception as e:
-                logger.error(f"Deserialization failed: {e}")
-                return None
+            if tag == MSGPACK_TAG:
+                return _msgpack_unpack(payload)
+            if tag == JSON_TAG:
+                return orjson.loads(payload)
+            # Untagged entries were pickled by an older release; they are not
+            # unpickled (unsafe) and simply expire within their TTL.
+            logger.debug("Ignoring cache entry in unknown format")
+            return None
+        except Exception as e:
+            logger.error(f"Deserialization failed: {e}")
+            return None
 
     def get(self, key: str, namespace: str = "") -> Optional[Any]:
         """Get value from cache."""
@@ -86,20 +344,22 @@ class CacheManager:
         try:
             # Try Redis first
             if self.redis_client:
-                value = self.redis_client.get(cache_key)
+                try:
+                    value = self.redis_client.get(cache_key)
+                except redis.RedisError as e:
+                    # Redis is down: values written meanwhile are in the memory cache
+                    self.cache_stats['errors'] += 1
+                    logger.error(f"Cache get error for key {key}, trying memory: {e}")
+                    value = None
                 if value is not None:
                     self.cache_stats['hits'] += 1
                     return self._deserialize_value(value)
 
             # Fallback to memory cache
-            if cache_key in self.memory_cache:
-                entry = self.memory_cache[cache_key]
-                if datetime.now() < entry['expires_at']:
-                    self.cache_stats['hits'] += 1
-                    return entry['value']
-                else:
-                    # Expired, remove it
-                    del self.memory_cache[cache_key]
+            found, value = self._recall(cache_key, time.monotonic())
+            if found:
+                self.cache_stats['hits'] += 1
+                return value
 
             self.cache_stats['misses'] += 1
             return None
@@ -109,32 +369,153 @@ class CacheManager:
             logger.error(f"Cache get error for key {key}: {e}")
             return None
 
-    async def set(self, key: str, value: Any, ttl_seconds: int = 3600, namespace: str = "") -> bool:
-        """Set value in cache with TTL."""
+    def _store(self, key: str, value: Any, ttl_seconds: int = 3600, namespace: str = "") -> bool:
+        """
+        Set value in Redis, blocking on the write.
+
+        The memory cache is only a fallback for when Redis is unavailable (reads
+        try Redis first), so it is written only if there is no Redis client or
+        the Redis write fails.
+        """
         cache_key = self._get_cache_key(key, namespace)
-        expires_at = datetime.now() + timedelta(seconds=ttl_seconds)
 
         try:
             serialized_value = self._serialize_value(value)
+        except Exception as e:
+            self.cache_stats['errors'] += 1
+            logger.error(f"Cache set error for key {key}: {e}")
+            return False
 
-            # Set in Redis
-            if self.redis_client:
-                self.redis_client.setex(cache_key, ttl_seconds, serialized_value)
+        if self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                self._queue_setex(pipe, cache_key, serialized_value, ttl_seconds, namespace)
+                pipe.execute()
+                self.cache_stats['sets'] += 1
+                return True
+            except Exception as e:
+                self.cache_stats['errors'] += 1
+                logger.error(f"Cache set error for key {key}, keeping it in memory: {e}")
 
-            # Also set in memory cache
-            self.memory_cache[cache_key] = {
-                'value': value,
-                'expires_at': expires_at
-            }
+        self._remember(cache_key, value, ttl_seconds, namespace, len(serialized_value))
+        self.cache_stats['sets'] += 1
+        return True
 
-            self.cache_stats['sets'] += 1
-            return True
+    async def set(self, key: str, value: Any, ttl_seconds: int = 3600, namespace: str = "") -> bool:
+        """Set value in cache with TTL."""
+        return self._store(key, value, ttl_seconds, namespace)
 
+    def mset(self, items: Dict[str, Any], ttl_seconds: int = 3600, namespace: str = "") -> bool:
+        """Set many values with a single pipelined Redis round-trip."""
+        try:
+            entries = [
+                (self._get_cache_key(key, namespace), value, self._serialize_value(value))
+                for key, value in items.items()
+            ]
         except Exception as e:
             self.cache_stats['errors'] += 1
-            logger.error(f"Cache set error for key {key}: {e}")
+            logger.error(f"Cache mset error for {len(items)} keys: {e}")
             return False
 
+        if self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for cache_key, _, serialized_value in entries:
+                    self._queue_setex(pipe, cache_key, serialized_value, ttl_seconds, namespace)
+                pipe.execute()
+                self.cache_stats['sets'] += len(entries)
+                return True
+            except Exception as e:
+                self.cache_stats['errors'] += 1
+                logger.error(f"Cache mset error for {len(items)} keys, keeping them in memory: {e}")
+
+        # Memory fallback, as in _store
+        for cache_key, value, serialized_value in entries:
+            self._remember(cache_key, value, ttl_seconds, namespace, len(serialized_value))
+        self.cache_stats['sets'] += len(entries)
+        return True
+
+    def mget(self, keys: List[str], namespace: str = "") -> Dict[str, Any]:
+        """Get many values with a single Redis MGET; missing keys are omitted."""
+        results: Dict[str, Any] = {}
+        cache_keys = [self._get_cache_key(key, namespace) for key in keys]
+
+        try:
+            raw_values = [None] * len(keys)
+            if self.redis_client:
+                try:
+                    raw_values = self.redis_client.mget(cache_keys)
+                except redis.RedisError as e:
+                    # Redis is down: values written meanwhile are in the memory cache
+                    self.cache_stats['errors'] += 1
+                    logger.error(f"Cache mget error for {len(keys)} keys, trying memory: {e}")
+            now = time.monotonic()
+
+            for key, cache_key, raw in zip(keys, cache_keys, raw_values):
+                if raw is not None:
+                    results[key] = self._deserialize_value(raw)
+                    continue
+
+                # Fallback to memory cache
+                found, value = self._recall(cache_key, now)
+                if found:
+                    results[key] = value
+
+            self.cache_stats['hits'] += len(results)
+            self.cache_stats['misses'] += len(keys) - len(results)
+            return results
+
+        except Exception as e:
+            self.cache_stats['errors'] += 1
+            logger.error(f"Cache mget error for {len(keys)} keys: {e}")
+            return results
+
+    def set_behind(self, key: str, value: Any, ttl_seconds: int = 3600, namespace: str = "") -> None:
+        """
+        Set value in the memory cache now and queue the Redis write.
+
+        A daemon thread drains the queue and writes batches with one pipelined
+        round-trip, so the caller never waits on Redis.
+        """
+        cache_key = self._get_cache_key(key, namespace)
+        serialized_value = self._serialize_value(value)
+        self._remember(cache_key, value, ttl_seconds, namespace, len(serialized_value))
+        self.cache_stats['sets'] += 1
+
+        if self.redis_client:
+            self._write_queue.put((cache_key, serialized_value, ttl_seconds, namespace))
+            self._ensure_writer()
+
+    def _ensure_writer(self) -> None:
+        """Start the write-behind thread on first use."""
+        if self._writer_thread is not None and self._writer_thread.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer_thread is None or not self._writer_thread.is_alive():
+                self._writer_thread = threading.Thread(
+                    target=self._drain_writes, name="cache-write-behind", daemon=True
+                )
+                self._writer_thread.start()
+
+    def _drain_writes(self) -> None:
+        """Flush queued writes to Redis in pipelined batches."""
+        while True:
+            batch = [self._write_queue.get()]
+            while len(batch) < WRITE_BEHIND_BATCH_SIZE:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for cache_key, serialized_value, ttl_seconds, namespace in batch:
+                    self._queue_setex(pipe, cache_key, serialized_value, ttl_seconds, namespace)
+                pipe.execute()
+            except Exception as e:
+                self.cache_stats['errors'] += 1
+                logger.error(f"Cache write-behind error for {len(batch)} keys: {e}")
+
     def delete(self, key: str, namespace: str = "") -> bool:
         """Delete value from cache."""
         cache_key = self._get_cache_key(key, namespace)
@@ -144,13 +525,20 @@ class CacheManager:
 
             # Delete from Redis
             if self.redis_client:
-                if self.redis_client.delete(cache_key):
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.delete(cache_key)
+                if namespace:
+                    pipe.srem(self._namespace_index(namespace), cache_key)
+                if pipe.execute()[0]:
                     deleted = True
 
-            # Delete from memory cache
-            if cache_key in self.memory_cache:
-                del self.memory_cache[cache_key]
+            # Delete from memory cache and the @cached memos
+            if self._forget(cache_key):
                 deleted = True
+            with _memo_lock:
+                for memo in _namespace_memos.get(namespace, ()):
+                    for memo_key in [k for k, entry in memo.items() if entry[0] == key]:
+                        del memo[memo_key]
 
             if deleted:
                 self.cache_stats['deletes'] += 1
@@ -167,19 +555,33 @@ class CacheManager:
         try:
             cleared = 0
 
-            # Clear Redis namespace
+            # Clear Redis namespace. SSCAN walks the namespace index incrementally
+            # instead of blocking the server like KEYS, and UNLINK frees memory
+            # off-thread. Members whose keys already expired unlink as 0.
             if self.redis_client:
-                pattern = f"{namespace}:*"
-                keys = self.redis_client.keys(pattern)
-                if keys:
-                    self.redis_client.delete(*keys)
-                    cleared += len(keys)
+                index_key = self._namespace_index(namespace)
+                batch = []
+                for key in self.redis_client.sscan_iter(index_key, count=CLEAR_BATCH_SIZE):
+                    batch.append(key)
+                    if len(batch) >= CLEAR_BATCH_SIZE:
+                        cleared += self._unlink_batch(batch)
+                        batch = []
+                if batch:
+                    cleared += self._unlink_batch(batch)
+                self.redis_client.delete(index_key)
+
+            with _memo_lock:
+                for memo in _namespace_memos.get(namespace, ()):
+                    memo.clear()
 
             # Clear memory cache namespace
-            keys_to_delete = [k for k in self.memory_cache.keys() if k.startswith(f"{namespace}:")]
-            for key in keys_to_delete:
-                del self.memory_cache[key]
-                cleared += 1
+            memory_cleared = 0
+            with self._memory_lock:
+                for key in self.namespace_keys.pop(namespace, ()):
+                    if self._forget(key):
+                        memory_cleared += 1
+            if not self.redis_client:
+                cleared = memory_cleared
 
             return cleared
 
@@ -187,6 +589,13 @@ class CacheManager:
             logger.error(f"Cache clear namespace error for {namespace}: {e}")
             return 0
 
+    def _unlink_batch(self, keys: List[bytes]) -> int:
+        """Unlink a batch of Redis keys in one pipelined round-trip."""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.unlink(key)
+        return sum(pipe.execute())
+
     def get_stats(self) -> Dict[str, Any]:
         """Get cache performance statistics."""
         total_requests = self.cache_stats['hits'] + self.cache_stats['misses']
@@ -197,6 +606,7 @@ class CacheManager:
             'hit_rate': round(hit_rate, 2),
             'total_requests': total_requests,
             'memory_cache_size': len(self.memory_cache),
+            'memory_cache_bytes': self.memory_bytes,
             'redis_connected': self.redis_client is not None
         }
 
@@ -221,10 +631,7 @@ class CacheManager:
         # Check memory cache
         try:
             # Clean expired entries
-            now = datetime.now()
-            expired_keys = [k for k, v in self.memory_cache.items() if now >= v['expires_at']]
-            for key in expired_keys:
-                del self.memory_cache[key]
+            self._sweep_expired(time.monotonic())
         except Exception as e:
             health['errors'].append(f"Memory cache: {e}")
             health['memory'] = False
@@ -235,30 +642,76 @@ class CacheManager:
 # Global cache instance
 cache_manager = CacheManager()
 
-def cached(ttl_seconds: int = 3600, namespace: str = ""):
-    """Decorator for caching function results."""
+def cached(ttl_seconds: int = 3600, namespace: str = "", write_behind: bool = False):
+    """Decorator for caching function results.
+
+    Results are memoized in-process first (for up to MEMO_TTL_SECONDS), so
+    repeated calls skip key building, the Redis round trip and
+    deserialization. Every hit gets its own copy of the memoized result (see
+    _copy_result); delete() and clear_namespace() evict it. With ``write_behind=True`` results are stored
+    in memory immediately and written to Redis by a background thread instead
+    of on the call path.
+    """
     def decorator(func):
+        memo: "OrderedDict[Any, Tuple[str, Any, float]]" = OrderedDict()
+        with _memo_lock:
+            _namespace_memos.setdefault(namespace, []).append(memo)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Create cache key from function name and arguments
-            key_parts = [func.__name__]
-            key_parts.extend(str(arg) for arg in args)
-            key_parts.extend(f"{k}:{v}" for k, v in sorted(kwargs.items()))
-            cache_key = "|".join(key_parts)
+            kwarg_items = tuple(sorted(kwargs.items())) if kwargs else ()
+            try:
+                memo_key = (tuple(_memo_arg(arg) for arg in args),
+                            tuple((name, _memo_arg(value)) for name, value in kwarg_items))
+                hash(memo_key)
+            except TypeError:
+                # Unhashable or non-weakrefable arguments go straight to the cache manager
+                memo_key = None
+            if memo_key is not None:
+                with _memo_lock:
+                    entry = memo.get(memo_key)
+                    if entry is not None:
+                        if time.monotonic() < entry[2]:
+                            memo.move_to_end(memo_key)
+                        else:
+                            del memo[memo_key]
+                            entry = None
+                if entry is not None:
+                    return _copy_result(entry[1])
+
+            # Create cache key from function name and arguments, only on a memo miss
+            cache_key = repr((func.__qualname__, args, kwarg_items))
 
             # Try to get from cache first
-            cached_result = cache_manager.get(cache_key, namespace)
-            if cached_result is not None:
-                logger.debug(f"Cache hit for {func.__name__}")
-                return cached_result
-
-            # Execute function and cache result
-            result = func(*args, **kwargs)
+            result = cache_manager.get(cache_key, namespace)
             if result is not None:
-                cache_manager.set(cache_key, result, ttl_seconds, namespace)
+                logger.debug(f"Cache hit for {func.__name__}")
+            else:
+                # Execute function and cache result
+                result = func(*args, **kwargs)
+                if result is None:
+                    return None
+                if write_behind:
+                    cache_manager.set_behind(cache_key, result, ttl_seconds, namespace)
+                else:
+                    cache_manager._store(cache_key, result, ttl_seconds, namespace)
                 logger.debug(f"Cached result for {func.__name__}")
 
+            if memo_key is not None:
+                # The memo keeps its own copy, since the caller owns the result
+                entry = (cache_key, _copy_result(result),
+                         time.monotonic() + min(ttl_seconds, MEMO_TTL_SECONDS))
+                with _memo_lock:
+                    memo[memo_key] = entry
+                    if len(memo) > MEMO_MAX_ENTRIES:
+                        memo.popitem(last=False)
             return result
+
+        def cache_clear():
+            with _memo_lock:
+                memo.clear()
+
+        wrapper.cache_clear = cache_clear
         return wrapper
     return decorator
 
@@ -1,17 +1,57 @@
 """Compliance and audit logging system for regulatory requirements."""
 import logging
-import json
 import hashlib
+import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 import uuid
 
-from .database import DatabaseManager, AuditLog
+import orjson
+from sqlalchemy import delete, func, select
+
+from .database import DatabaseManager, AuditLog, db_manager, row_to_dict
 
 logger = logging.getLogger(__name__)
 
+# AuditLog.service_name of every row written by ComplianceLogger
+AUDIT_SERVICE_NAME = "compliance"
+
+# Old audit rows deleted per transaction by cleanup_old_logs
+AUDIT_CLEANUP_BATCH_SIZE = 5000
+
+# Canonical encoding for event checksums: sorted keys at every level, naive
+# timestamps marked as UTC, and non-string detail keys stringified
+CHECKSUM_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+def _check_sha256_backend():
+    """Warn when hashlib falls back to its builtin SHA-256 instead of OpenSSL's."""
+    if type(hashlib.sha256()).__module__ != '_hashlib':
+        logger.warning("hashlib.sha256 is not backed by OpenSSL; audit checksums "
+                       "will not use hardware-accelerated SHA-256")
+
+_check_sha256_backend()
+
+# Event ids are drawn from a pool filled by one os.urandom call per refill
+# rather than one getrandom syscall per uuid4()
+EVENT_ID_POOL_SIZE = 128
+_event_id_pool: List[str] = []
+# A forked child must not hand out ids its parent already pooled
+if hasattr(os, 'register_at_fork'):  # Unix only
+    os.register_at_fork(after_in_child=_event_id_pool.clear)
+
+def _new_event_id() -> str:
+    """Return a random (version 4) UUID string for an audit event."""
+    try:
+        return _event_id_pool.pop()
+    except IndexError:
+        raw = os.urandom(16 * EVENT_ID_POOL_SIZE)
+        _event_id_pool.extend(
+            str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(16, len(raw), 16)
+        )
+        return str(uuid.UUID(bytes=raw[:16], version=4))
+
 class AuditEventType(Enum):
     """Types of audit events."""
     SYSTEM_STARTUP = "system_startup"
@@ -38,6 +78,14 @@ class ComplianceLevel(Enum):
 @dataclass
 class AuditEvent:
     """Audit event data structure."""
+    # Declared by hand because dataclass(slots=True) needs Python 3.10
+    __slots__ = (
+        'event_id', 'event_type', 'timestamp', 'user_id', 'session_id',
+        'resource', 'action', 'status', 'details', 'compliance_level',
+        'ip_address', 'user_agent', 'checksum',
+        'event_type_value', 'compliance_level_value'
+    )
+
     event_id: str
     event_type: AuditEventType
     timestamp: datetime
@@ -53,77 +101,110 @@ class AuditEvent:
     checksum: Optional[str]
 
     def __post_init__(self):
+        # Enum .value goes through a descriptor; read it once per event
+        self.event_type_value = self.event_type.value
+        self.compliance_level_value = self.compliance_level.value
         if not self.event_id:
-            self.event_id = str(uuid.uuid4())
+            self.event_id = _new_event_id()
         if not self.checksum:
             self.checksum = self._calculate_checksum()
 
     def _calculate_checksum(self) -> str:
-        """Calculate SHA256 checksum of the event data."""
+        """Calculate SHA256 checksum of the event data in a single serialization pass."""
         event_data = {
             'event_id': self.event_id,
-            'event_type': self.event_type.value,
-            'timestamp': self.timestamp.isoformat(),
+            'event_type': self.event_type_value,
+            'timestamp': self.timestamp,
             'user_id': self.user_id,
             'session_id': self.session_id,
             'resource': self.resource,
             'action': self.action,
             'status': self.status,
-            'details': json.dumps(self.details, sort_keys=True, default=str),
-            'compliance_level': self.compliance_level.value,
+            'details': self.details,
+            'compliance_level': self.compliance_level_value,
             'ip_address': self.ip_address,
             'user_agent': self.user_agent
         }
 
-        data_str = json.dumps(event_data, sort_keys=True, default=str)
-        return hashlib.sha256(data_str.encode()).hexdigest()
+        # One contiguous buffer, hashed in a single call into OpenSSL
+        data = orjson.dumps(event_data, option=CHECKSUM_OPTIONS, default=str)
+        return hashlib.sha256(data).hexdigest()
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
-        data = asdict(self)
-        data['event_type'] = self.event_type.value
-        data['compliance_level'] = self.compliance_level.value
-        data['timestamp'] = self.timestamp.isoformat()
-        return data
+        return {
+            'event_id': self.event_id,
+            'event_type': self.event_type_value,
+            'timestamp': self.timestamp.isoformat(),
+            'user_id': self.user_id,
+            'session_id': self.session_id,
+            'resource': self.resource,
+            'action': self.action,
+            'status': self.status,
+            'details': self.details,
+            'compliance_level': self.compliance_level_value,
+            'ip_address': self.ip_address,
+            'user_agent': self.user_agent,
+            'checksum': self.checksum
+        }
 
 class ComplianceLogger:
     """Compliance and audit logging system."""
 
-    def __init__(self):
+    def __init__(self, db: Optional[DatabaseManager] = None):
         self.session_id = str(uuid.uuid4())
         self.retention_days = 365  # Keep logs for 1 year
         self.max_log_size_mb = 100  # Max size per log file
         self.encryption_enabled = True
+        self.db = db or db_manager
+
+    def _audit_row(self, event: AuditEvent) -> Dict[str, Any]:
+        """Build the AuditLog column mapping for an event."""
+        # "email:someone@example.com" -> entity_type "email", entity_id "someone@example.com"
+        entity_type, _, entity_id = event.resource.partition(':')
+        return {
+            'action': f"{event.event_type_value}:{event.action}",
+            'event_type': event.event_type_value,
+            'entity_type': entity_type,
+            'entity_id': entity_id[:50] or None,
+            'status': event.status,
+            'user_id': event.user_id,
+            'user_ip': event.ip_address,
+            'user_agent': event.user_agent,
+            'request_id': event.event_id,
+            'service_name': AUDIT_SERVICE_NAME,
+            'new_values': {
+                'resource': event.resource,
+                'session_id': event.session_id,
+                'details': event.details,
+                'compliance_level': event.compliance_level_value,
+                'checksum': event.checksum
+            },
+            'created_at': event.timestamp
+        }
+
+    async def flush(self):
+        """Wait until every queued audit event has been written."""
+        await self.db.flush_writes()
 
-    def log_event(self, event: AuditEvent):
-        """Log an audit event."""
+    async def log_event(self, event: AuditEvent):
+        """
+        Log an audit event.
+
+        HIGH and CRITICAL events are inserted and committed before returning.
+        Lower levels go on the database manager's compliance queue, which
+        waits for room rather than dropping and bulk-inserts in the
+        background; await flush() to wait for those.
+        """
         try:
-            # Persist to database
-            with DatabaseManager.get_session() as session:
-                db_log = AuditLog(
-                    action=f"{event.event_type.value}:{event.action}",
-                    user_id=event.user_id,
-                    ip_address=event.ip_address,
-                    user_agent=event.user_agent,
-                    context_data={
-                        'event_id': event.event_id,
-                        'event_type': event.event_type.value,
-                        'status': event.status,
-                        'details': event.details,
-                        'compliance_level': event.compliance_level.value,
-                        'checksum': event.checksum
-                    },
-                    timestamp=event.timestamp,
-                    session_id=event.session_id,
-                    compliance_flags={
-                        'level': event.compliance_level.value,
-                        'resource': event.resource
-                    }
-                )
-                session.add(db_log)
+            row = self._audit_row(event)
+            if event.compliance_level in (ComplianceLevel.HIGH, ComplianceLevel.CRITICAL):
+                await self.db.bulk_insert_audit([row])
+            else:
+                await self.db.log_compliance_audit(**row)
 
             # Log to file for immediate access
-            logger.info(f"AUDIT: {event.event_type.value} - {event.resource} - {event.status}")
+            logger.info(f"AUDIT: {event.event_type_value} - {event.resource} - {event.status}")
 
             # Handle high-compliance events
             if event.compliance_level in [ComplianceLevel.HIGH, ComplianceLevel.CRITICAL]:
@@ -137,7 +218,7 @@ class ComplianceLogger:
     def _log_to_file(self, event: AuditEvent):
         """Fallback logging to file."""
         try:
-            log_entry = json.dumps(event.to_dict(), default=str)
+            log_entry = orjson.dumps(event.to_dict(), default=str).decode()
             logger.error(f"AUDIT_FALLBACK: {log_entry}")
         except Exception as e:
             logger.critical(f"Complete audit logging failure: {e}")
@@ -145,9 +226,9 @@ class ComplianceLogger:
     def _handle_high_compliance_event(self, event: AuditEvent):
         """Handle high-compliance level events."""
         # Could send notifications, trigger alerts, etc.
-        logger.warning(f"HIGH COMPLIANCE EVENT: {event.event_type.value} - {event.resource}")
+        logger.warning(f"HIGH COMPLIANCE EVENT: {event.event_type_value} - {event.resource}")
 
-    def log_system_startup(self, details: Dict[str, Any] = None):
+    async def log_system_startup(self, details: Dict[str, Any] = None):
         """Log system startup event."""
         event = AuditEvent(
             event_id="",
@@ -164,9 +245,9 @@ class ComplianceLogger:
             user_agent=None,
             checksum=None
         )
-        self.log_event(event)
+        await self.log_event(event)
 
-    def log_system_shutdown(self, details: Dict[str, Any] = None):
+    async def log_system_shutdown(self, details: Dict[str, Any] = None):
         """Log system shutdown event."""
         event = AuditEvent(
             event_id="",
@@ -183,9 +264,9 @@ class ComplianceLogger:
             user_agent=None,
             checksum=None
         )
-        self.log_event(event)
+        await self.log_event(event)
 
-    def log_ipo_data_fetch(self, source: str, count: int, status: str, details: Dict[str, Any] = None):
+    async def log_ipo_data_fetch(self, source: str, count: int, status: str, details: Dict[str, Any] = None):
         """Log IPO data fetching event."""
         event = AuditEvent(
             event_id="",
@@ -206,9 +287,9 @@ class ComplianceLogger:
             user_agent=None,
             checksum=None
         )
-        self.log_event(event)
+        await self.log_event(event)
 
-    def log_email_send(self, recipient: str, subject: str, status: str, details: Dict[str, Any] = None):
+    async def log_email_send(self, recipient: str, subject: str, status: str, details: Dict[str, Any] = None):
         """Log email sending event."""
         event = AuditEvent(
             event_id="",
@@ -229,9 +310,9 @@ class ComplianceLogger:
             user_agent=None,
             checksum=None
         )
-        self.log_event(event)
+        await self.log_event(event)
 
-    def log_api_call(self, api_name: str, endpoint: str, status: str, details: Dict[str, Any] = None):
+    async def log_api_call(self, api_name: str, endpoint: str, status: str, details: Dict[str, Any] = None):
         """Log API call event."""
         event = AuditEvent(
             event_id="",
@@ -252,9 +333,9 @@ class ComplianceLogger:
             user_agent=None,
             checksum=None
         )
-        self.log_event(event)
+        await self.log_event(event)
 
-    def log_error(self, error_type: str, error_message: str, details: Dict[str, Any] = None):
+    async def log_error(self, error_type: str, error_message: str, details: Dict[str, Any] = None):
         """Log error event."""
         event = AuditEvent(
             event_id="",
@@ -275,9 +356,9 @@ class ComplianceLogger:
             user_agent=None,
             checksum=None
         )
-        self.log_event(event)
+        await self.log_event(event)
 
-    def log_security_event(self, event_type: str, details: Dict[str, Any]):
+    async def log_security_event(self, event_type: str, details: Dict[str, Any]):
         """Log security-related event."""
         event = AuditEvent(
             event_id="",
@@ -294,43 +375,67 @@ class ComplianceLogger:
             user_agent=None,
             checksum=None
         )
-        self.log_event(event)
-
-    def get_audit_trail(self, resource: str = None, event_type: AuditEventType = None,
-                       start_date: datetime = None, end_date: datetime = None,
-                       limit: int = 100) -> List[Dict[str, Any]]:
-        """Retrieve audit trail with filtering."""
+        await self.log_event(event)
+
+    async def get_audit_trail(self, resource: str = None, event_type: AuditEventType = None,
+                              start_date: datetime = None, end_date: datetime = None,
+                              limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Retrieve audit trail with filtering.
+
+        ``resource`` selects events on a resource or under a resource prefix,
+        e.g. ``"email"`` or ``"api:bse"``.
+        """
+        # Include events still waiting in the write queue
+        await self.flush()
         try:
-            with DatabaseManager.get_session() as session:
-                query = session.query(AuditLog)
-
-                if resource:
-                    query = query.filter(AuditLog.resource.like(f"%{resource}%"))
-                if event_type:
-                    # Filter by event_type stored in context_data JSON field
-                    query = query.filter(AuditLog.context_data['event_type'].astext == event_type.value)
-                if start_date:
-                    query = query.filter(AuditLog.timestamp >= start_date)
-                if end_date:
-                    query = query.filter(AuditLog.timestamp <= end_date)
-
-                query = query.order_by(AuditLog.timestamp.desc()).limit(limit)
-
-                logs = query.all()
-                return [log.to_dict() for log in logs]
+            query = select(AuditLog)
+
+            if resource:
+                entity_type, _, entity_id = resource.partition(':')
+                query = query.where(AuditLog.entity_type == entity_type)
+                if entity_id:
+                    query = query.where(AuditLog.entity_id.startswith(entity_id, autoescape=True))
+            if event_type:
+                query = query.where(AuditLog.event_type == event_type.value)
+            if start_date:
+                query = query.where(AuditLog.created_at >= start_date)
+            if end_date:
+                query = query.where(AuditLog.created_at <= end_date)
+
+            query = query.order_by(AuditLog.created_at.desc()).limit(limit)
+
+            async with self.db.get_session() as session:
+                logs = (await session.execute(query)).scalars()
+                return [row_to_dict(log) for log in logs]
 
         except Exception as e:
             logger.error(f"Failed to retrieve audit trail: {e}")
             return []
 
-    def generate_compliance_report(self, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
-        """Generate compliance report for a date range."""
+    async def generate_compliance_report(self, start_date: datetime, end_date: datetime,
+                                         include_details: bool = False) -> Dict[str, Any]:
+        """
+        Generate compliance report for a date range.
+
+        Counts are aggregated by the database; the individual events are only
+        fetched (up to 10,000) when ``include_details`` is set.
+        """
+        # Count events still waiting in the write queue
+        await self.flush()
         try:
-            audit_trail = self.get_audit_trail(
-                start_date=start_date,
-                end_date=end_date,
-                limit=10000  # Large limit for reporting
-            )
+            in_period = (AuditLog.created_at >= start_date, AuditLog.created_at <= end_date)
+            async with self.db.get_session() as session:
+                events_by_type = dict((await session.execute(
+                    select(AuditLog.event_type, func.count())
+                    .where(*in_period)
+                    .group_by(AuditLog.event_type)
+                )).all())
+                events_by_status = dict((await session.execute(
+                    select(AuditLog.status, func.count())
+                    .where(*in_period)
+                    .group_by(AuditLog.status)
+                )).all())
 
             report = {
                 'report_period': {
@@ -338,35 +443,20 @@ class ComplianceLogger:
                     'end_date': end_date.isoformat()
                 },
                 'summary': {
-                    'total_events': len(audit_trail),
-                    'events_by_type': {},
-                    'events_by_status': {},
-                    'compliance_violations': 0,
-                    'security_events': 0
-                },
-                'details': audit_trail
+                    'total_events': sum(events_by_status.values()),
+                    'events_by_type': events_by_type,
+                    'events_by_status': events_by_status,
+                    'compliance_violations': events_by_status.get('FAILURE', 0),
+                    'security_events': events_by_type.get(AuditEventType.SECURITY_EVENT.value, 0)
+                }
             }
 
-            # Analyze events
-            for event in audit_trail:
-                event_type = event['event_type']
-                status = event['status']
-
-                # Count by type
-                if event_type not in report['summary']['events_by_type']:
-                    report['summary']['events_by_type'][event_type] = 0
-                report['summary']['events_by_type'][event_type] += 1
-
-                # Count by status
-                if status not in report['summary']['events_by_status']:
-                    report['summary']['events_by_status'][status] = 0
-                report['summary']['events_by_status'][status] += 1
-
-                # Count violations and security events
-                if status == 'FAILURE':
-                    report['summary']['compliance_violations'] += 1
-                if event_type == 'security_event':
-                    report['summary']['security_events'] += 1
+            if include_details:
+                report['details'] = await self.get_audit_trail(
+                    start_date=start_date,
+                    end_date=end_date,
+                    limit=10000  # Large limit for reporting
+                )
 
             return report
 
@@ -374,52 +464,72 @@ class ComplianceLogger:
             logger.error(f"Failed to generate compliance report: {e}")
             return {'error': str(e)}
 
-    def cleanup_old_logs(self, days_to_keep: int = None):
-        """Clean up old audit logs beyond retention period."""
+    async def cleanup_old_logs(self, days_to_keep: int = None) -> int:
+        """Clean up old audit logs beyond retention period; returns the rows deleted."""
         if days_to_keep is None:
             days_to_keep = self.retention_days
 
         cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
 
+        # Delete in bounded chunks, each in its own transaction, so no single
+        # long-running write transaction holds locks or bloats the WAL
+        expired_ids = (
+            select(AuditLog.id)
+            .where(AuditLog.created_at < cutoff_date)
+            .limit(AUDIT_CLEANUP_BATCH_SIZE)
+            .scalar_subquery()
+        )
+        delete_chunk = (
+            delete(AuditLog)
+            .where(AuditLog.id.in_(expired_ids))
+            .execution_options(synchronize_session=False)
+        )
+        deleted_count = 0
+
         try:
-            with DatabaseManager.get_session() as session:
-                deleted_count = session.query(AuditLog).filter(
-                    AuditLog.timestamp < cutoff_date
-                ).delete()
+            while True:
+                async with self.db.get_session() as session:
+                    deleted = (await session.execute(delete_chunk)).rowcount
+                if not deleted:
+                    break
+                deleted_count += deleted
 
-                logger.info(f"Cleaned up {deleted_count} old audit log entries")
+            logger.info(f"Cleaned up {deleted_count} old audit log entries")
 
         except Exception as e:
             logger.error(f"Failed to cleanup old audit logs: {e}")
 
+        return deleted_count
+
 # Global compliance logger instance
 compliance_logger = ComplianceLogger()
 
 # Convenience functions
-def log_event(event: AuditEvent):
+async def log_event(event: AuditEvent):
     """Log an audit event."""
-    compliance_logger.log_event(event)
+    await compliance_logger.log_event(event)
 
-def log_system_startup(details: Dict[str, Any] = None):
+async def log_system_startup(details: Dict[str, Any] = None):
     """Log system startup."""
-    compliance_logger.log_system_startup(details)
+    await compliance_logger.log_system_startup(details)
 
-def log_system_shutdown(details: Dict[str, Any] = None):
+async def log_system_shutdown(details: Dict[str, Any] = None):
     """Log system shutdown."""
-    compliance_logger.log_system_shutdown(details)
+    await compliance_logger.log_system_shutdown(details)
 
-def log_ipo_data_fetch(source: str, count: int, status: str, details: Dict[str, Any] = None):
+async def log_ipo_data_fetch(source: str, count: int, status: str, details: Dict[str, Any] = None):
     """Log IPO data fetch."""
-    compliance_logger.log_ipo_data_fetch(source, count, status, details)
+    await compliance_logger.log_ipo_data_fetch(source, count, status, details)
 
-def log_email_send(recipient: str, subject: str, status: str, details: Dict[str, Any] = None):
+async def log_email_send(recipient: str, subject: str, status: str, details: Dict[str, Any] = None):
     """Log email send."""
-    compliance_logger.log_email_send(recipient, subject, status, details)
+    await compliance_logger.log_email_send(recipient, subject, status, details)
 
-def get_audit_trail(**kwargs) -> List[Dict[str, Any]]:
+async def get_audit_trail(**kwargs) -> List[Dict[str, Any]]:
     """Get audit trail."""
-    return compliance_logger.get_audit_trail(**kwargs)
+    return await compliance_logger.get_audit_trail(**kwargs)
 
-def generate_compliance_report(start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+async def generate_compliance_report(start_date: datetime, end_date: datetime,
+                                     include_details: bool = False) -> Dict[str, Any]:
     """Generate compliance report."""
-    return compliance_logger.generate_compliance_report(start_date, end_date)
+    return await compliance_logger.generate_compliance_report(start_date, end_date, include_details)
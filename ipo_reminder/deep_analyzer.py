@@ -7,13 +7,17 @@ and fundamental investment principles.
 import logging
 import re
 import requests
+from collections import OrderedDict
 from datetime import date, datetime
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Pattern, Tuple, Any
 from dataclasses import dataclass
 from bs4 import BeautifulSoup
 
 logger = logging.getLogger(__name__)
 
+# Analyses each DeepIPOAnalyzer keeps, least recently used evicted first
+ANALYSIS_CACHE_MAX_ENTRIES = 512
+
 @dataclass
 class CompanyFinancials:
     """Company financial metrics."""
@@ -41,7 +45,7 @@ class IPODetails:
     lead_managers: List[str] = None
     registrar: Optional[str] = None
 
-@dataclass
+@dataclass(frozen=True)
 class IndustryAnalysis:
     """Industry and sector analysis."""
     sector: str
@@ -52,16 +56,16 @@ class IndustryAnalysis:
     cyclical_nature: bool = False
     entry_barriers: str = "MEDIUM"    # LOW, MEDIUM, HIGH
 
-@dataclass
+@dataclass(frozen=True)
 class RockSolidAnalysis:
-    """Comprehensive IPO analysis result."""
+    """Comprehensive IPO analysis result (frozen: results are cached and shared)."""
     recommendation: str  # STRONG_BUY, BUY, AVOID, STRONG_AVOID
     confidence_score: int  # 1-100
     risk_score: int  # 1-100 (higher = riskier)
     fair_value_estimate: Optional[float] = None
     upside_potential: Optional[float] = None  # percentage
-    key_strengths: List[str] = None
-    key_risks: List[str] = None
+    key_strengths: Tuple[str, ...] = ()
+    key_risks: Tuple[str, ...] = ()
     financial_health: str = "UNKNOWN"  # EXCELLENT, GOOD, AVERAGE, POOR, CRITICAL
     valuation_assessment: str = "UNKNOWN"  # UNDERVALUED, FAIRLY_VALUED, OVERVALUED
     management_quality: str = "UNKNOWN"  # EXCELLENT, GOOD, AVERAGE, POOR
@@ -70,6 +74,171 @@ class RockSolidAnalysis:
     final_verdict: str = ""
 
 
+# Sector classification rules for _analyze_industry, in priority order: the
+# first sector with a keyword anywhere in the lowercased company name wins.
+# The analyses are shared, which is why IndustryAnalysis is frozen.
+_SECTOR_RULES: Tuple[Tuple[Tuple[str, ...], IndustryAnalysis], ...] = (
+    # Technology & Software (highest growth, lowest cyclicality)
+    ((
+        'software', 'digital', 'automation', 'saas', 'fintech', 'cyber',
+        'data', 'ai', 'machine learning', 'cloud', 'internet', 'tech',
+        'information technology', 'it services', 'consulting services'
+    ), IndustryAnalysis(
+        sector="Technology & IT",
+        industry_growth_rate=18.0,  # High growth sector
+        market_size=80000.0,
+        competition_level="HIGH",
+        regulatory_risk="MEDIUM",
+        cyclical_nature=False,
+        entry_barriers="MEDIUM"
+    )),
+    # Healthcare/Pharma (defensive, stable growth)
+    ((
+        'healthcare', 'pharma', 'medical', 'bio', 'drug', 'hospital',
+        'pharmaceutical', 'biotech', 'diagnostics', 'health', 'medicine',
+        'life sciences', 'clinical'
+    ), IndustryAnalysis(
+        sector="Healthcare & Pharma",
+        industry_growth_rate=14.0,
+        market_size=75000.0,
+        competition_level="MEDIUM",
+        regulatory_risk="HIGH",
+        cyclical_nature=False,
+        entry_barriers="HIGH"
+    )),
+    # Financial Services (regulated, interest rate sensitive)
+    ((
+        'bank', 'finance', 'insurance', 'mutual', 'capital', 'nbfc',
+        'financial services', 'investment', 'securities', 'wealth',
+        'asset management', 'credit', 'lending'
+    ), IndustryAnalysis(
+        sector="Financial Services",
+        industry_growth_rate=12.0,
+        market_size=150000.0,
+        competition_level="HIGH",
+        regulatory_risk="VERY_HIGH",
+        cyclical_nature=True,
+        entry_barriers="HIGH"
+    )),
+    # Paper & Packaging (cyclical, commodity dependent)
+    (('paper',), IndustryAnalysis(
+        sector="Paper & Packaging",
+        industry_growth_rate=6.0,
+        market_size=35000.0,
+        competition_level="MEDIUM",
+        regulatory_risk="LOW",
+        cyclical_nature=True,
+        entry_barriers="MEDIUM"
+    )),
+    # Engineering & Infrastructure (government dependent)
+    ((
+        'engineering', 'construction', 'infrastructure', 'projects',
+        'civil', 'mechanical', 'electrical', 'contracting', 'roads',
+        'bridges', 'railways', 'metro', 'power transmission'
+    ), IndustryAnalysis(
+        sector="Engineering & Infrastructure",
+        industry_growth_rate=8.0,
+        market_size=120000.0,
+        competition_level="HIGH",
+        regulatory_risk="HIGH",
+        cyclical_nature=True,
+        entry_barriers="MEDIUM"
+    )),
+    # Manufacturing & Industrial (cyclical, cost sensitive)
+    ((
+        'manufacturing', 'industrial', 'auto', 'automotive', 'steel',
+        'chemical', 'cement', 'glass', 'rubber', 'plastic', 'metal',
+        'machinery', 'equipment', 'components'
+    ), IndustryAnalysis(
+        sector="Manufacturing & Industrial",
+        industry_growth_rate=7.0,
+        market_size=200000.0,
+        competition_level="HIGH",
+        regulatory_risk="MEDIUM",
+        cyclical_nature=True,
+        entry_barriers="MEDIUM"
+    )),
+    # Real Estate & Construction (interest rate sensitive)
+    ((
+        'real estate', 'property', 'housing', 'construction', 'land',
+        'residential', 'commercial', 'developers', 'builders'
+    ), IndustryAnalysis(
+        sector="Real Estate",
+        industry_growth_rate=5.0,
+        market_size=100000.0,
+        competition_level="HIGH",
+        regulatory_risk="HIGH",
+        cyclical_nature=True,
+        entry_barriers="MEDIUM"
+    )),
+    # Consumer Goods & Retail (brand dependent)
+    ((
+        'consumer', 'retail', 'fashion', 'food', 'beverage', 'fmcg',
+        'apparel', 'textile', 'cosmetics', 'personal care', 'household'
+    ), IndustryAnalysis(
+        sector="Consumer Goods",
+        industry_growth_rate=9.0,
+        market_size=80000.0,
+        competition_level="HIGH",
+        regulatory_risk="MEDIUM",
+        cyclical_nature=False,
+        entry_barriers="MEDIUM"
+    )),
+    # Energy & Power (commodity dependent)
+    ((
+        'power', 'energy', 'electric', 'utility', 'renewable', 'solar',
+        'wind', 'thermal', 'hydro', 'nuclear', 'transmission', 'distribution'
+    ), IndustryAnalysis(
+        sector="Energy & Power",
+        industry_growth_rate=6.0,
+        market_size=150000.0,
+        competition_level="MEDIUM",
+        regulatory_risk="HIGH",
+        cyclical_nature=True,
+        entry_barriers="HIGH"
+    )),
+    # Mining & Metals (commodity dependent)
+    ((
+        'mining', 'coal', 'mineral', 'extraction', 'metals', 'ore'
+    ), IndustryAnalysis(
+        sector="Mining & Metals",
+        industry_growth_rate=4.0,
+        market_size=60000.0,
+        competition_level="MEDIUM",
+        regulatory_risk="HIGH",
+        cyclical_nature=True,
+        entry_barriers="HIGH"
+    )),
+)
+
+def _sector_scanner(rules: Tuple[Tuple[Tuple[str, ...], IndustryAnalysis], ...]) -> Pattern[str]:
+    """Compile every sector's keywords into one pattern, one group per sector.
+
+    The alternation sits in a lookahead, so finditer tries each position of
+    the name once (matches may overlap) and reports, via lastindex, the
+    highest-priority sector with a keyword starting there.
+    """
+    groups = (
+        "(" + "|".join(re.escape(keyword) for keyword in keywords) + ")"
+        for keywords, _ in rules
+    )
+    return re.compile("(?=" + "|".join(groups) + ")")
+
+_SECTOR_SCAN = _sector_scanner(_SECTOR_RULES)
+_SECTOR_ANALYSES = tuple(analysis for _, analysis in _SECTOR_RULES)
+
+# Default when no sector keyword matches
+_OTHER_SERVICES = IndustryAnalysis(
+    sector="Other Services",
+    industry_growth_rate=7.0,
+    market_size=50000.0,
+    competition_level="MEDIUM",
+    regulatory_risk="MEDIUM",
+    cyclical_nature=False,
+    entry_barriers="MEDIUM"
+)
+
+
 class DeepIPOAnalyzer:
     """Comprehensive IPO analyzer with multiple data sources."""
     
@@ -78,9 +247,22 @@ class DeepIPOAnalyzer:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         })
+        # Completed analyses keyed by (casefolded company name, price band), in LRU order
+        self._analysis_cache: "OrderedDict[Tuple[str, str], RockSolidAnalysis]" = OrderedDict()
     
     def analyze_ipo_comprehensive(self, company_name: str, price_band: str) -> RockSolidAnalysis:
-        """Perform comprehensive IPO analysis."""
+        """Perform comprehensive IPO analysis.
+
+        Results are memoized per analyzer instance (up to
+        ANALYSIS_CACHE_MAX_ENTRIES), so repeated calls for the same IPO return
+        the same object. Failed analyses are not cached.
+        """
+        cache_key = (company_name.casefold(), price_band)
+        cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            self._analysis_cache.move_to_end(cache_key)
+            return cached
+
         logger.info(f"Starting deep analysis for {company_name}")
         
         try:
@@ -112,6 +294,9 @@ class DeepIPOAnalyzer:
             )
             
             logger.info(f"Deep analysis completed for {company_name}: {final_analysis.recommendation}")
+            self._analysis_cache[cache_key] = final_analysis
+            if len(self._analysis_cache) > ANALYSIS_CACHE_MAX_ENTRIES:
+                self._analysis_cache.popitem(last=False)
             return final_analysis
             
         except Exception as e:
@@ -121,8 +306,7 @@ class DeepIPOAnalyzer:
                 recommendation="AVOID",
                 confidence_score=20,
                 risk_score=80,
-                key_strengths=[],
-                key_risks=["Analysis failed - high uncertainty"],
+                key_risks=("Analysis failed - high uncertainty",),
                 final_verdict="Unable to complete analysis - exercise caution"
             )
     
@@ -164,171 +348,13 @@ class DeepIPOAnalyzer:
     
     def _analyze_industry(self, company_name: str) -> IndustryAnalysis:
         """Comprehensive industry and sector analysis with enhanced classification."""
-        # Advanced sector classification with more granular categories
-        name_lower = company_name.lower()
-
-        # Technology & Software (highest growth, lowest cyclicality)
-        if any(word in name_lower for word in [
-            'software', 'digital', 'automation', 'saas', 'fintech', 'cyber',
-            'data', 'ai', 'machine learning', 'cloud', 'internet', 'tech',
-            'information technology', 'it services', 'consulting services'
-        ]) or ('tech' in name_lower and 'paper' not in name_lower):
-            return IndustryAnalysis(
-                sector="Technology & IT",
-                industry_growth_rate=18.0,  # High growth sector
-                market_size=80000.0,
-                competition_level="HIGH",
-                regulatory_risk="MEDIUM",
-                cyclical_nature=False,
-                entry_barriers="MEDIUM"
-            )
-
-        # Healthcare/Pharma (defensive, stable growth)
-        if any(word in name_lower for word in [
-            'healthcare', 'pharma', 'medical', 'bio', 'drug', 'hospital',
-            'pharmaceutical', 'biotech', 'diagnostics', 'health', 'medicine',
-            'life sciences', 'clinical'
-        ]):
-            return IndustryAnalysis(
-                sector="Healthcare & Pharma",
-                industry_growth_rate=14.0,
-                market_size=75000.0,
-                competition_level="MEDIUM",
-                regulatory_risk="HIGH",
-                cyclical_nature=False,
-                entry_barriers="HIGH"
-            )
-
-        # Financial Services (regulated, interest rate sensitive)
-        elif any(word in name_lower for word in [
-            'bank', 'finance', 'insurance', 'mutual', 'capital', 'nbfc',
-            'financial services', 'investment', 'securities', 'wealth',
-            'asset management', 'credit', 'lending'
-        ]):
-            return IndustryAnalysis(
-                sector="Financial Services",
-                industry_growth_rate=12.0,
-                market_size=150000.0,
-                competition_level="HIGH",
-                regulatory_risk="VERY_HIGH",
-                cyclical_nature=True,
-                entry_barriers="HIGH"
-            )
-
-        # Paper & Packaging (cyclical, commodity dependent)
-        if 'paper' in name_lower:
-            return IndustryAnalysis(
-                sector="Paper & Packaging",
-                industry_growth_rate=6.0,
-                market_size=35000.0,
-                competition_level="MEDIUM",
-                regulatory_risk="LOW",
-                cyclical_nature=True,
-                entry_barriers="MEDIUM"
-            )
-
-        # Engineering & Infrastructure (government dependent)
-        elif any(word in name_lower for word in [
-            'engineering', 'construction', 'infrastructure', 'projects',
-            'civil', 'mechanical', 'electrical', 'contracting', 'roads',
-            'bridges', 'railways', 'metro', 'power transmission'
-        ]):
-            return IndustryAnalysis(
-                sector="Engineering & Infrastructure",
-                industry_growth_rate=8.0,
-                market_size=120000.0,
-                competition_level="HIGH",
-                regulatory_risk="HIGH",
-                cyclical_nature=True,
-                entry_barriers="MEDIUM"
-            )
-
-        # Manufacturing & Industrial (cyclical, cost sensitive)
-        elif any(word in name_lower for word in [
-            'manufacturing', 'industrial', 'auto', 'automotive', 'steel',
-            'chemical', 'cement', 'glass', 'rubber', 'plastic', 'metal',
-            'machinery', 'equipment', 'components'
-        ]):
-            return IndustryAnalysis(
-                sector="Manufacturing & Industrial",
-                industry_growth_rate=7.0,
-                market_size=200000.0,
-                competition_level="HIGH",
-                regulatory_risk="MEDIUM",
-                cyclical_nature=True,
-                entry_barriers="MEDIUM"
-            )
-
-        # Real Estate & Construction (interest rate sensitive)
-        elif any(word in name_lower for word in [
-            'real estate', 'property', 'housing', 'construction', 'land',
-            'residential', 'commercial', 'developers', 'builders'
-        ]):
-            return IndustryAnalysis(
-                sector="Real Estate",
-                industry_growth_rate=5.0,
-                market_size=100000.0,
-                competition_level="HIGH",
-                regulatory_risk="HIGH",
-                cyclical_nature=True,
-                entry_barriers="MEDIUM"
-            )
-
-        # Consumer Goods & Retail (brand dependent)
-        elif any(word in name_lower for word in [
-            'consumer', 'retail', 'fashion', 'food', 'beverage', 'fmcg',
-            'apparel', 'textile', 'cosmetics', 'personal care', 'household'
-        ]):
-            return IndustryAnalysis(
-                sector="Consumer Goods",
-                industry_growth_rate=9.0,
-                market_size=80000.0,
-                competition_level="HIGH",
-                regulatory_risk="MEDIUM",
-                cyclical_nature=False,
-                entry_barriers="MEDIUM"
-            )
-
-        # Energy & Power (commodity dependent)
-        elif any(word in name_lower for word in [
-            'power', 'energy', 'electric', 'utility', 'renewable', 'solar',
-            'wind', 'thermal', 'hydro', 'nuclear', 'transmission', 'distribution'
-        ]):
-            return IndustryAnalysis(
-                sector="Energy & Power",
-                industry_growth_rate=6.0,
-                market_size=150000.0,
-                competition_level="MEDIUM",
-                regulatory_risk="HIGH",
-                cyclical_nature=True,
-                entry_barriers="HIGH"
-            )
-
-        # Mining & Metals (commodity dependent)
-        elif any(word in name_lower for word in [
-            'mining', 'coal', 'mineral', 'extraction', 'metals', 'ore'
-        ]):
-            return IndustryAnalysis(
-                sector="Mining & Metals",
-                industry_growth_rate=4.0,
-                market_size=60000.0,
-                competition_level="MEDIUM",
-                regulatory_risk="HIGH",
-                cyclical_nature=True,
-                entry_barriers="HIGH"
-            )
-
-        # Default/Other
-        else:
-            return IndustryAnalysis(
-                sector="Other Services",
-                industry_growth_rate=7.0,
-                market_size=50000.0,
-                competition_level="MEDIUM",
-                regulatory_risk="MEDIUM",
-                cyclical_nature=False,
-                entry_barriers="MEDIUM"
-            )
+        # One pass over the name; keep the highest-priority sector seen
+        best = len(_SECTOR_ANALYSES)
+        for match in _SECTOR_SCAN.finditer(company_name.lower()):
+            best = min(best, match.lastindex - 1)
+            if best == 0:
+                break
+        return _SECTOR_ANALYSES[best] if best < len(_SECTOR_ANALYSES) else _OTHER_SERVICES
     
     def _perform_valuation_analysis(self, ipo_details: IPODetails, financials: CompanyFinancials, 
                                    industry: IndustryAnalysis) -> Dict[str, Any]:
@@ -533,8 +559,8 @@ class DeepIPOAnalyzer:
             confidence_score=max(1, min(100, confidence)),
             risk_score=overall_risk,
             fair_value_estimate=valuation.get("fair_value_estimate"),
-            key_strengths=strengths,
-            key_risks=risks,
+            key_strengths=tuple(strengths),
+            key_risks=tuple(risks),
             financial_health=self._assess_financial_health(financials),
             valuation_assessment=valuation.get("valuation_assessment", "UNKNOWN"),
             management_quality=management.get("management_quality", "UNKNOWN"),
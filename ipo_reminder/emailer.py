@@ -1,18 +1,29 @@
 """Simple email sending functionality using SMTP with enhanced security."""
+import asyncio
+import functools
 import logging
 import os
 import smtplib
 import html
 import re
+import ssl
 from datetime import datetime
 from email.message import EmailMessage
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from email.utils import formataddr
 
-from ipo_reminder.config import SENDER_EMAIL, SENDER_PASSWORD, RECIPIENT_EMAIL, validate_email_config
+import aiosmtplib
+
+from ipo_reminder.config import (
+    SENDER_EMAIL, SENDER_PASSWORD, RECIPIENT_EMAIL, SMTP_USE_SSL, validate_email_config
+)
+from ipo_reminder.logging_config import get_file_logger
 
 logger = logging.getLogger(__name__)
 
+EMAIL_LOG_NAME = "ipo_reminder.email_log"
+EMAIL_LOG_FILE = "logs/email.log"
+
 
 class EmailError(Exception):
     """Custom exception for email-related errors."""
@@ -50,30 +61,119 @@ def _validate_email_address(email: str) -> bool:
 def _append_email_log(status: str, recipient: str, subject: str, detail: str = "") -> None:
     """Append email attempt to log file with timestamp and sanitization."""
     try:
-        os.makedirs("logs", exist_ok=True)
         timestamp = datetime.utcnow().isoformat() + "Z"
         # Sanitize log data
         safe_recipient = _sanitize_text(recipient)
         safe_subject = _sanitize_text(subject)
         safe_detail = _sanitize_text(detail)
-        log_entry = f"{timestamp}\t{status}\t{safe_recipient}\t{safe_subject}\t{safe_detail}\n"
-        with open("logs/email.log", "a", encoding="utf-8") as f:
-            f.write(log_entry)
+        log_entry = f"{timestamp}\t{status}\t{safe_recipient}\t{safe_subject}\t{safe_detail}"
+        get_file_logger(EMAIL_LOG_NAME, EMAIL_LOG_FILE).info(log_entry)
     except Exception as e:
         logger.warning(f"Failed to write email log: {e}")
 
 
-def send_email(
+def _parse_recipients(value: Optional[str]) -> List[str]:
+    """Split a comma-separated recipient setting into individual addresses."""
+    if not value:
+        return []
+    return [address.strip() for address in value.split(",") if address.strip()]
+
+
+# Outlook/Office 365 servers only offer STARTTLS on 587, never implicit TLS
+STARTTLS_ONLY_HOSTS = frozenset({'smtp-mail.outlook.com', 'smtp.office365.com'})
+
+
+def _get_smtp_settings(sender: str) -> Tuple[str, int, bool]:
+    """Resolve the SMTP host, port and TLS mode for the sender's email provider.
+
+    Returns ``(host, port, implicit_tls)``. With SMTP_USE_SSL the SMTPS port
+    465 is used with implicit TLS, which skips the STARTTLS upgrade
+    round-trip, except for STARTTLS_ONLY_HOSTS, which always get STARTTLS on
+    587.
+    """
+    sender_domain = sender.split('@')[1].lower() if '@' in sender else ''
+    default_port = 465 if SMTP_USE_SSL else 587
+
+    if sender_domain in ['gmail.com', 'googlemail.com']:
+        logger.info("Using Gmail SMTP settings")
+        return 'smtp.gmail.com', default_port, SMTP_USE_SSL
+    if sender_domain in ['outlook.com', 'hotmail.com', 'live.com']:
+        logger.info("Using Outlook SMTP settings")
+        return 'smtp-mail.outlook.com', 587, False
+    if sender_domain in ['yahoo.com', 'ymail.com']:
+        logger.info("Using Yahoo SMTP settings")
+        return 'smtp.mail.yahoo.com', default_port, SMTP_USE_SSL
+
+    # Use custom settings or defaults
+    smtp_server = os.getenv('SMTP_SERVER', 'smtp-mail.outlook.com')
+    implicit_tls = SMTP_USE_SSL and smtp_server.lower() not in STARTTLS_ONLY_HOSTS
+    smtp_port = int(os.getenv('SMTP_PORT', '465' if implicit_tls else '587'))
+    logger.info(f"Using custom SMTP settings: {smtp_server}:{smtp_port}")
+    return smtp_server, smtp_port, implicit_tls
+
+
+def _open_smtp(smtp_server: str, smtp_port: int, implicit_tls: bool) -> smtplib.SMTP:
+    """Open a TLS-protected SMTP connection, via implicit TLS or STARTTLS."""
+    if implicit_tls:
+        return smtplib.SMTP_SSL(
+            smtp_server, smtp_port, timeout=30, context=ssl.create_default_context()
+        )
+
+    smtp = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
+    try:
+        smtp.ehlo()
+        smtp.starttls()
+        smtp.ehlo()
+    except Exception:
+        smtp.close()
+        raise
+    return smtp
+
+
+def _build_message(
     subject: str,
     body: str,
-    html_body: Optional[str] = None,
-    recipients: Optional[List[str]] = None,
-) -> bool:
-    """Send an email using SMTP with enhanced security validation."""
+    html_body: Optional[str],
+    sender: str,
+    recipients: List[str],
+) -> EmailMessage:
+    """Build the outgoing message with a plain-text part and optional HTML alternative.
+
+    Text parts are UTF-8. EmailMessage picks 7bit or 8bit transfer encoding for
+    normal-length lines and only falls back to quoted-printable or base64 when
+    a line is too long.
+    """
+    msg = EmailMessage()
+    msg['Subject'] = subject
+    # Set friendly display name for the sender with validation
+    msg['From'] = formataddr(("IPO Reminder", sender))
+    msg['To'] = ', '.join(recipients)
+
+    msg.set_content(body)
+    if html_body and html_body.strip():
+        msg.add_alternative(html_body, subtype='html')
+    return msg
+
+
+def _get_sender_credentials() -> Tuple[Optional[str], Optional[str]]:
+    """Return the sender address and password, preferring the live environment."""
+    sender = os.getenv('SENDER_EMAIL') or SENDER_EMAIL
+    password = os.getenv('SENDER_PASSWORD') or SENDER_PASSWORD
+    return sender, password
+
+
+def _prepare_email(
+    subject: str,
+    body: str,
+    html_body: Optional[str],
+    recipients: Optional[List[str]],
+    sender: str,
+) -> Optional[Tuple[EmailMessage, List[str]]]:
+    """Sanitize and validate inputs, returning the message and its valid recipients."""
     # Validate and sanitize inputs
     if not subject or not body:
         logger.error("Subject and body are required")
-        return False
+        return None
 
     subject = _sanitize_text(subject)
     body = _sanitize_text(body)
@@ -82,7 +182,7 @@ def send_email(
         html_body = _sanitize_html(html_body)
 
     if not recipients:
-        recipients = [RECIPIENT_EMAIL]
+        recipients = _parse_recipients(RECIPIENT_EMAIL)
 
     # Validate all recipients
     valid_recipients = []
@@ -94,10 +194,23 @@ def send_email(
 
     if not valid_recipients:
         logger.error("No valid recipients found")
-        return False
+        return None
 
-    sender = os.getenv('SENDER_EMAIL') or SENDER_EMAIL
-    password = os.getenv('SENDER_PASSWORD') or SENDER_PASSWORD
+    return _build_message(subject, body, html_body, sender, valid_recipients), valid_recipients
+
+
+def send_email(
+    subject: str,
+    body: str,
+    html_body: Optional[str] = None,
+    recipients: Optional[List[str]] = None,
+) -> bool:
+    """Send an email using SMTP with enhanced security validation.
+
+    All recipients are delivered in a single SMTP transaction. When no
+    recipients are given, the comma-separated RECIPIENT_EMAIL setting is used.
+    """
+    sender, password = _get_sender_credentials()
 
     if not sender or not password:
         logger.error("SMTP configured but SENDER_EMAIL or SENDER_PASSWORD is missing")
@@ -107,70 +220,144 @@ def send_email(
         logger.error(f"Invalid sender email address: {sender}")
         return False
 
-    # Provider-specific SMTP settings with validation
-    sender_domain = sender.split('@')[1].lower() if '@' in sender else ''
-
-    if sender_domain in ['gmail.com', 'googlemail.com']:
-        smtp_server = 'smtp.gmail.com'
-        smtp_port = 587
-        logger.info("Using Gmail SMTP settings")
-    elif sender_domain in ['outlook.com', 'hotmail.com', 'live.com']:
-        smtp_server = 'smtp-mail.outlook.com'
-        smtp_port = 587
-        logger.info("Using Outlook SMTP settings")
-    elif sender_domain in ['yahoo.com', 'ymail.com']:
-        smtp_server = 'smtp.mail.yahoo.com'
-        smtp_port = 587
-        logger.info("Using Yahoo SMTP settings")
-    else:
-        # Use custom settings or defaults
-        smtp_server = os.getenv('SMTP_SERVER', 'smtp-mail.outlook.com')
-        smtp_port = int(os.getenv('SMTP_PORT', '587'))
-        logger.info(f"Using custom SMTP settings: {smtp_server}:{smtp_port}")
-
-    msg = EmailMessage()
-    msg['Subject'] = subject
-    # Set friendly display name for the sender with validation
-    msg['From'] = formataddr(("IPO Reminder", sender))
-    msg['To'] = ', '.join(valid_recipients)
+    prepared = _prepare_email(subject, body, html_body, recipients, sender)
+    if prepared is None:
+        return False
+    msg, valid_recipients = prepared
+    subject = msg['Subject']
 
-    if html_body and html_body.strip():
-        msg.set_content(body)
-        msg.add_alternative(html_body, subtype='html')
-    else:
-        msg.set_content(body)
+    smtp_server, smtp_port, implicit_tls = _get_smtp_settings(sender)
 
     try:
         validate_email_config()
-        with smtplib.SMTP(smtp_server, smtp_port, timeout=30) as s:
-            s.ehlo()
-            s.starttls()
-            s.ehlo()
+        with _open_smtp(smtp_server, smtp_port, implicit_tls) as s:
             s.login(sender, password)
-            s.send_message(msg)
+            # One transaction for all recipients: many RCPT TO lines, one DATA.
+            # send_message() flattens with CRLF line endings and keeps 8bit
+            # parts as-is; declare them when the server supports 8BITMIME.
+            mail_options = ['BODY=8BITMIME'] if s.has_extn('8bitmime') else []
+            s.send_message(msg, sender, valid_recipients, mail_options=mail_options)
         logger.info(f"Email sent via SMTP to {', '.join(valid_recipients)}")
-        _append_email_log("SMTP_SENT", valid_recipients[0], subject)
+        _append_email_log("SMTP_SENT", ', '.join(valid_recipients), subject)
         return True
     except smtplib.SMTPAuthenticationError as e:
         logger.error(f"SMTP authentication failed: {e}")
-        _append_email_log("SMTP_AUTH_FAILED", valid_recipients[0], subject, str(e))
+        _append_email_log("SMTP_AUTH_FAILED", ', '.join(valid_recipients), subject, str(e))
         return False
     except smtplib.SMTPConnectError as e:
         logger.error(f"SMTP connection failed: {e}")
-        _append_email_log("SMTP_CONNECT_FAILED", valid_recipients[0], subject, str(e))
+        _append_email_log("SMTP_CONNECT_FAILED", ', '.join(valid_recipients), subject, str(e))
         return False
     except Exception as e:
         logger.error(f"SMTP send failed: {e}")
-        _append_email_log("SMTP_FAILED", valid_recipients[0], subject, str(e))
+        _append_email_log("SMTP_FAILED", ', '.join(valid_recipients), subject, str(e))
         return False
 
 
+async def send_email_async(
+    subject: str,
+    body: str,
+    html_body: Optional[str] = None,
+    recipients: Optional[List[str]] = None,
+) -> bool:
+    """Run the blocking send_email in the default executor so the event loop stays free."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, functools.partial(send_email, subject, body, html_body=html_body, recipients=recipients)
+    )
+
+
+class AsyncEmailer:
+    """Persistent async SMTP client that keeps one authenticated connection open.
+
+    The TLS handshake and AUTH happen once on first use; later sends reuse the
+    same channel. A background NOOP keeps the session alive between sends and a
+    dropped connection is re-established transparently on the next send.
+    """
+
+    KEEPALIVE_INTERVAL_SECONDS = 60
+
+    def __init__(self, sender: Optional[str] = None, password: Optional[str] = None):
+        default_sender, default_password = _get_sender_credentials()
+        self.sender = sender or default_sender
+        self.password = password or default_password
+        self._client: Optional[aiosmtplib.SMTP] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Created lazily so the lock binds to the running event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        """Open, secure and authenticate a new SMTP connection."""
+        smtp_server, smtp_port, implicit_tls = _get_smtp_settings(self.sender)
+        client = aiosmtplib.SMTP(
+            hostname=smtp_server, port=smtp_port, use_tls=implicit_tls, start_tls=False, timeout=30
+        )
+        await client.connect()
+        if not implicit_tls:
+            await client.starttls()
+        await client.login(self.sender, self.password)
+        logger.info(f"Opened persistent SMTP connection to {smtp_server}:{smtp_port}")
+
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.create_task(self._keepalive())
+        return client
+
+    async def _ensure_connected(self) -> aiosmtplib.SMTP:
+        if self._client is None or not self._client.is_connected:
+            self._client = await self._connect()
+        return self._client
+
+    async def _keepalive(self) -> None:
+        """Send NOOP periodically so the server does not drop an idle session."""
+        while True:
+            await asyncio.sleep(self.KEEPALIVE_INTERVAL_SECONDS)
+            async with self._get_lock():
+                if self._client is None:
+                    continue
+                try:
+                    await self._client.noop()
+                except aiosmtplib.SMTPException as e:
+                    logger.debug(f"SMTP keep-alive failed, reconnecting on next send: {e}")
+                    self._client = None
+
+    async def send(self, msg: EmailMessage) -> None:
+        """Send a prepared message over the shared connection."""
+        async with self._get_lock():
+            client = await self._ensure_connected()
+            try:
+                await client.send_message(msg)
+            except aiosmtplib.SMTPServerDisconnected:
+                logger.info("SMTP server disconnected, reconnecting")
+                self._client = None
+                client = await self._ensure_connected()
+                await client.send_message(msg)
+
+    async def close(self) -> None:
+        """Stop the keep-alive task and close the SMTP connection."""
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+
+        async with self._get_lock():
+            if self._client is not None:
+                try:
+                    await self._client.quit()
+                except aiosmtplib.SMTPException as e:
+                    logger.debug(f"Error closing SMTP connection: {e}")
+                self._client = None
+
+
 class Emailer:
     """Email service class for sending IPO reminder emails."""
 
     def __init__(self):
         """Initialize the emailer."""
-        pass
+        self.transport = AsyncEmailer()
 
     async def send_email(
         self,
@@ -191,14 +378,41 @@ class Emailer:
         Returns:
             bool: True if email sent successfully, False otherwise
         """
+        sender = self.transport.sender
+        if not sender or not self.transport.password:
+            logger.error("SMTP configured but SENDER_EMAIL or SENDER_PASSWORD is missing")
+            return False
+
+        if not _validate_email_address(sender):
+            logger.error(f"Invalid sender email address: {sender}")
+            return False
+
+        prepared = _prepare_email(
+            subject,
+            "This email contains HTML content. Please view in HTML mode.",  # Plain text body
+            html_content,
+            [recipient_email] if recipient_email else None,
+            sender,
+        )
+        if prepared is None:
+            return False
+        msg, valid_recipients = prepared
+
         try:
-            # Call the existing send_email function with correct parameters
-            return send_email(
-                subject=subject,
-                body="This email contains HTML content. Please view in HTML mode.",  # Plain text body
-                html_body=html_content,
-                recipients=[recipient_email] if recipient_email else None
-            )
+            validate_email_config()
+            await self.transport.send(msg)
+            logger.info(f"Email sent via SMTP to {', '.join(valid_recipients)}")
+            _append_email_log("SMTP_SENT", ', '.join(valid_recipients), msg['Subject'])
+            return True
+        except aiosmtplib.SMTPAuthenticationError as e:
+            logger.error(f"SMTP authentication failed: {e}")
+            _append_email_log("SMTP_AUTH_FAILED", ', '.join(valid_recipients), msg['Subject'], str(e))
+            return False
         except Exception as e:
             logger.error(f"Emailer.send_email failed: {e}")
+            _append_email_log("SMTP_FAILED", ", ".join(valid_recipients), msg['Subject'], str(e))
             return False
+
+    async def close(self) -> None:
+        """Close the underlying SMTP connection."""
+        await self.transport.close()
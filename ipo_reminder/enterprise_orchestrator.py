@@ -12,7 +12,7 @@ from ipo_reminder.config import (
     SENDER_EMAIL, SENDER_PASSWORD, RECIPIENT_EMAIL,
     DATABASE_URL, REDIS_URL, BSE_API_KEY, NSE_API_KEY
 )
-from .database import DatabaseManager, IPOData, IPORecommendation
+from .database import db_manager, IPOData, IPORecommendation
 from .cache import CacheManager
 from .official_apis import BSEAPIClient, NSEAPIClient
 from .monitoring import monitoring_system, record_metric, increment_counter
@@ -32,7 +32,7 @@ class EnterpriseIPOOrchestrator:
     """Enterprise-grade IPO reminder orchestrator."""
 
     def __init__(self):
-        self.db_manager = DatabaseManager()
+        self.db_manager = db_manager
         self.cache_manager = CacheManager()
         self.bse_client = BSEAPIClient()
         self.nse_client = NSEAPIClient()
@@ -72,7 +72,7 @@ class EnterpriseIPOOrchestrator:
             monitoring_system.start_monitoring()
 
             # Log system startup
-            log_system_startup({
+            await log_system_startup({
                 'components': ['database', 'cache', 'bse_api', 'nse_api', 'monitoring'],
                 'version': 'enterprise-v1.0'
             })
@@ -97,21 +97,25 @@ class EnterpriseIPOOrchestrator:
             await self.bse_client.shutdown()
             await self.nse_client.shutdown()
 
+            # Close the persistent SMTP connection
+            await self.emailer.close()
+
             # Shutdown cache
             await self.cache_manager.shutdown()
 
+            # Log system shutdown while the database can still record it;
+            # db_manager.shutdown() writes out the queued audit rows
+            await log_system_shutdown({
+                'shutdown_reason': 'normal',
+                'uptime_seconds': getattr(monitoring_system, '_start_time', 0)
+            })
+
             # Shutdown database
             await self.db_manager.shutdown()
 
             # Shutdown thread pool
             self.executor.shutdown(wait=True)
 
-            # Log system shutdown
-            log_system_shutdown({
-                'shutdown_reason': 'normal',
-                'uptime_seconds': getattr(monitoring_system, '_start_time', 0)
-            })
-
             logger.info("Enterprise orchestrator shutdown complete")
 
         except Exception as e:
@@ -132,12 +136,12 @@ class EnterpriseIPOOrchestrator:
                 bse_data = await self.bse_client.get_ipo_data(target_date)
                 ipo_data.extend(bse_data)
                 record_metric('bse_api_calls', 1.0, {'status': 'success'})
-                compliance_logger.log_api_call('bse', 'upcoming_ipos', 'SUCCESS',
+                await compliance_logger.log_api_call('bse', 'upcoming_ipos', 'SUCCESS',
                                              {'record_count': len(bse_data)})
             except Exception as e:
                 logger.warning(f"BSE API failed: {e}")
                 record_metric('bse_api_calls', 1.0, {'status': 'failure', 'error': str(e)})
-                compliance_logger.log_api_call('bse', 'upcoming_ipos', 'FAILURE',
+                await compliance_logger.log_api_call('bse', 'upcoming_ipos', 'FAILURE',
                                              {'error': str(e)})
 
             # Fetch from NSE
@@ -145,12 +149,12 @@ class EnterpriseIPOOrchestrator:
                 nse_data = await self.nse_client.get_ipo_data(target_date)
                 ipo_data.extend(nse_data)
                 record_metric('nse_api_calls', 1.0, {'status': 'success'})
-                compliance_logger.log_api_call('nse', 'upcoming_ipos', 'SUCCESS',
+                await compliance_logger.log_api_call('nse', 'upcoming_ipos', 'SUCCESS',
                                              {'record_count': len(nse_data)})
             except Exception as e:
                 logger.warning(f"NSE API failed: {e}")
                 record_metric('nse_api_calls', 1.0, {'status': 'failure', 'error': str(e)})
-                compliance_logger.log_api_call('nse', 'upcoming_ipos', 'FAILURE',
+                await compliance_logger.log_api_call('nse', 'upcoming_ipos', 'FAILURE',
                                              {'error': str(e)})
 
             # If official APIs fail, use web scraping as fallback
@@ -171,7 +175,7 @@ class EnterpriseIPOOrchestrator:
             record_metric('ipo_fetch_duration', duration)
             record_metric('ipo_fetch_success', 1.0, {'count': len(ipo_data)})
 
-            compliance_logger.log_ipo_data_fetch('enterprise', len(ipo_data), 'SUCCESS',
+            await compliance_logger.log_ipo_data_fetch('enterprise', len(ipo_data), 'SUCCESS',
                                                {'duration_seconds': duration, 'sources': ['bse', 'nse', 'scraping']})
 
             return ipo_data
@@ -181,7 +185,7 @@ class EnterpriseIPOOrchestrator:
             record_metric('ipo_fetch_duration', duration)
             record_metric('ipo_fetch_failure', 1.0, {'error': str(e)})
 
-            compliance_logger.log_ipo_data_fetch('enterprise', 0, 'FAILURE',
+            await compliance_logger.log_ipo_data_fetch('enterprise', 0, 'FAILURE',
                                                {'error': str(e), 'duration_seconds': duration})
 
             logger.error(f"Enterprise IPO fetch failed: {e}")
@@ -408,7 +412,7 @@ class EnterpriseIPOOrchestrator:
             if success:
                 record_metric('emails_sent', 1.0)
                 increment_counter('email_notifications')
-                compliance_logger.log_email_send(
+                await compliance_logger.log_email_send(
                     RECIPIENT_EMAIL,
                     f"IPO Reminder • {datetime.now().strftime('%B %d, %Y')}",
                     'SUCCESS',
@@ -416,7 +420,7 @@ class EnterpriseIPOOrchestrator:
                 )
             else:
                 record_metric('emails_failed', 1.0)
-                compliance_logger.log_email_send(
+                await compliance_logger.log_email_send(
                     RECIPIENT_EMAIL,
                     f"IPO Reminder • {datetime.now().strftime('%B %d, %Y')}",
                     'FAILURE',
@@ -426,7 +430,7 @@ class EnterpriseIPOOrchestrator:
         except Exception as e:
             logger.error(f"Failed to send enterprise notifications: {e}")
             record_metric('email_send_errors', 1.0, {'error': str(e)})
-            compliance_logger.log_error('email_send', str(e), {'ipo_count': len(analyzed_ipos)})
+            await compliance_logger.log_error('email_send', str(e), {'ipo_count': len(analyzed_ipos)})
 
     async def _generate_enterprise_email_content(self, analyzed_ipos: List[Dict[str, Any]]) -> str:
         """Generate comprehensive enterprise email content."""
@@ -533,7 +537,7 @@ class EnterpriseIPOOrchestrator:
         except Exception as e:
             logger.error(f"Enterprise cycle failed: {e}")
             record_metric('cycle_failed', 1.0, {'error': str(e)})
-            compliance_logger.log_error('enterprise_cycle', str(e))
+            await compliance_logger.log_error('enterprise_cycle', str(e))
 
     async def get_system_status(self) -> Dict[str, Any]:
         """Get comprehensive system status."""
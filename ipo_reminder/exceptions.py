@@ -130,8 +130,8 @@ class NotFoundError(IPOReminderError):
 # Database Errors (500)
 class DatabaseError(IPOReminderError):
     """Base class for database-related errors."""
-    def __init__(self, message: str = "Database error", **kwargs):
-        super().__init__(message, status_code=500, error_code="database_error", **kwargs)
+    def __init__(self, message: str = "Database error", error_code: str = "database_error", **kwargs):
+        super().__init__(message, status_code=500, error_code=error_code, **kwargs)
 
 class ConnectionError(DatabaseError):
     """Raised when a database connection cannot be established."""
@@ -4,15 +4,17 @@ Centralized logging configuration for the IPO Reminder system.
 This module provides a consistent logging configuration across the entire application,
 with support for different log levels, file rotation, and structured logging.
 """
-import os
 import sys
+import atexit
+import queue
 import logging
 import logging.handlers
 from pathlib import Path
 from typing import Optional, Dict, Any, Union
-import json
 from datetime import datetime
 
+import orjson
+
 # Log levels as strings for configuration
 LOG_LEVELS = {
     'DEBUG': logging.DEBUG,
@@ -36,6 +38,9 @@ DEFAULT_JSON_FORMAT = {
     'thread': '%(thread)d',
 }
 
+# Background listeners that own the file handlers, keyed by logger name
+_queue_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
 class JsonFormatter(logging.Formatter):
     """Custom formatter for structured JSON logging."""
     
@@ -65,12 +70,64 @@ class JsonFormatter(logging.Formatter):
         if hasattr(record, 'extra') and isinstance(record.extra, dict):
             log_record.update(record.extra)
         
-        return json.dumps(log_record, ensure_ascii=False)
+        return orjson.dumps(log_record, default=str).decode()
 
 def get_log_level(level_name: str) -> int:
     """Get the logging level from a string name."""
     return LOG_LEVELS.get(level_name.upper(), logging.INFO)
 
+def _stop_queue_listener(name: str) -> None:
+    """Drain and stop the background listener registered under a logger name."""
+    listener = _queue_listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+def _start_queue_listener(name: str, handler: logging.Handler) -> logging.handlers.QueueHandler:
+    """
+    Run a handler on a background thread and return a QueueHandler that feeds it.
+
+    Logging calls then only enqueue the record; the disk write happens on the
+    listener thread so callers (including the event loop) never block on I/O.
+    """
+    _stop_queue_listener(name)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    _queue_listeners[name] = listener
+    return logging.handlers.QueueHandler(log_queue)
+
+def flush_queued_logs() -> None:
+    """Block until every queued record has been written by its listener."""
+    for listener in _queue_listeners.values():
+        # stop() drains the queue and joins the thread; start() resumes it
+        listener.stop()
+        listener.start()
+
+def stop_queued_logging() -> None:
+    """Drain and stop all background log listeners."""
+    for name in list(_queue_listeners):
+        _stop_queue_listener(name)
+
+atexit.register(stop_queued_logging)
+
+def _create_file_handler(
+    log_file: str,
+    max_bytes: int,
+    backup_count: int,
+) -> logging.handlers.RotatingFileHandler:
+    """Create a rotating file handler, making the log directory if needed."""
+    log_path = Path(log_file).absolute()
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    return logging.handlers.RotatingFileHandler(
+        filename=log_path,
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding='utf-8'
+    )
+
 def setup_logging(
     log_level: str = 'INFO',
     log_file: Optional[str] = None,
@@ -104,6 +161,7 @@ def setup_logging(
     # Remove any existing handlers
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    _stop_queue_listener('')
     
     # Add console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -113,20 +171,11 @@ def setup_logging(
     
     # Add file handler if log file is specified
     if log_file:
-        # Create log directory if it doesn't exist
-        log_path = Path(log_file).absolute()
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Use RotatingFileHandler for log rotation
-        file_handler = logging.handlers.RotatingFileHandler(
-            filename=log_path,
-            maxBytes=max_bytes,
-            backupCount=backup_count,
-            encoding='utf-8'
-        )
+        # Use RotatingFileHandler for log rotation, written from a background thread
+        file_handler = _create_file_handler(log_file, max_bytes, backup_count)
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        root_logger.addHandler(_start_queue_listener('', file_handler))
     
     # Configure third-party loggers
     logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
@@ -135,6 +184,35 @@ def setup_logging(
     logging.getLogger('aiohttp').setLevel(logging.WARNING)
     logging.getLogger('aioredis').setLevel(logging.INFO)
 
+    logger.info("Logging configured with level=%s, format=%s, file=%s",
+                log_level, log_format, log_file or 'console')
+
+def get_file_logger(
+    name: str,
+    log_file: str,
+    fmt: str = '%(message)s',
+    max_bytes: int = 10 * 1024 * 1024,  # 10MB
+    backup_count: int = 5,
+) -> logging.Logger:
+    """
+    Get a logger that writes only to its own file through a background queue.
+    
+    Args:
+        name: Logger name
+        log_file: Path to the log file
+        fmt: Format string for each record
+        max_bytes: Maximum log file size in bytes before rotation
+        backup_count: Number of backup log files to keep
+    """
+    file_logger = logging.getLogger(name)
+    if not file_logger.handlers:
+        file_handler = _create_file_handler(log_file, max_bytes, backup_count)
+        file_handler.setFormatter(logging.Formatter(fmt))
+        file_logger.addHandler(_start_queue_listener(name, file_handler))
+        file_logger.setLevel(logging.INFO)
+        file_logger.propagate = False
+    return file_logger
+
 def get_logger(name: str = None) -> logging.Logger:
     """
     Get a logger with the given name.
@@ -144,20 +222,5 @@ def get_logger(name: str = None) -> logging.Logger:
     """
     return logging.getLogger(name)
 
-# Initialize logging with default configuration
-LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-LOG_FILE = os.getenv('LOG_FILE')
-LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
-
-setup_logging(
-    log_level=LOG_LEVEL,
-    log_file=LOG_FILE,
-    log_format=LOG_FORMAT,
-)
-
 # Create a default logger for this module
 logger = get_logger(__name__)
-
-# Log the logging configuration
-logger.info("Logging configured with level=%s, format=%s, file=%s", 
-           LOG_LEVEL, LOG_FORMAT, LOG_FILE or 'console')
@@ -28,12 +28,13 @@ from tenacity import (
 )
 
 from ipo_reminder.database import DatabaseManager, IPOData, AuditLog
-from ipo_reminder.cache import cache_manager, cache_ipo_data
+from ipo_reminder.cache import cache_manager, cache_ipo_data, register_cache_type
 from ipo_reminder.config import (
     BSE_API_KEY, BSE_API_BASE_URL, BSE_API_TIMEOUT,
     NSE_API_KEY, NSE_API_BASE_URL, NSE_API_TIMEOUT,
     CIRCUIT_BREAKER_FAILURE_THRESHOLD, CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
-    CIRCUIT_BREAKER_HALF_OPEN_MAX_REQUESTS, MAX_CONCURRENT_API_REQUESTS,
+    CIRCUIT_BREAKER_HALF_OPEN_MAX_REQUESTS, CIRCUIT_BREAKER_EXPECTED_EXCEPTION,
+    MAX_CONCURRENT_API_REQUESTS,
     BSE_API_RATE_LIMIT, NSE_API_RATE_LIMIT
 )
 from ipo_reminder.rate_limiting import (
@@ -98,6 +99,7 @@ def async_retry(**retry_kwargs: Any) -> Callable[[F], F]:
 
 logger = logging.getLogger(__name__)
 
+@register_cache_type
 @dataclass
 class OfficialIPOData:
     """Standardized IPO data from official sources."""
@@ -154,7 +156,8 @@ class BSEAPIClient:
         circuit_breaker_config = CircuitBreakerConfig(
             failure_threshold=CIRCUIT_BREAKER_FAILURE_THRESHOLD,
             recovery_timeout=CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
-            half_open_max_requests=CIRCUIT_BREAKER_HALF_OPEN_MAX_REQUESTS
+            half_open_max_requests=CIRCUIT_BREAKER_HALF_OPEN_MAX_REQUESTS,
+            expected_exceptions=CIRCUIT_BREAKER_EXPECTED_EXCEPTION
         )
         self.circuit_breaker = CircuitBreaker("BSE_API", circuit_breaker_config)
         self.bulkhead = Bulkhead(MAX_CONCURRENT_API_REQUESTS)
@@ -0,0 +1,33 @@
+"""Prebuilt statements for the hottest database reads.
+
+Each statement is a lambda_stmt, so it is built and compiled once per process
+and later executions only bind new parameter values:
+
+    result = await session.execute(OPEN_IPOS, {"today": today})
+"""
+from sqlalchemy import bindparam, lambda_stmt, select
+
+from .database import CircuitBreakerState, IPOData
+
+# IPOs closing on or after :today (the open and upcoming working set)
+OPEN_IPOS = lambda_stmt(
+    lambda: select(IPOData).where(IPOData.close_date >= bindparam("today"))
+)
+
+# IPOs closing in [:day_start, :day_end)
+IPOS_CLOSING_BETWEEN = lambda_stmt(
+    lambda: select(IPOData).where(
+        IPOData.close_date >= bindparam("day_start"),
+        IPOData.close_date < bindparam("day_end"),
+    )
+)
+
+# The circuit breaker row for :service_name
+CIRCUIT_BREAKER_BY_SERVICE = lambda_stmt(
+    lambda: select(CircuitBreakerState).where(
+        CircuitBreakerState.service_name == bindparam("service_name")
+    )
+)
+
+# Every circuit breaker row
+ALL_CIRCUIT_BREAKERS = lambda_stmt(lambda: select(CircuitBreakerState))
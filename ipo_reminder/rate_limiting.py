@@ -10,7 +10,7 @@ This module provides:
 """
 import time
 import asyncio
-from typing import Dict, Optional, Callable, Any, Awaitable, TypeVar, cast
+from typing import Dict, Optional, Callable, Any, Awaitable, Tuple, Type, TypeVar, cast
 from functools import wraps
 import logging
 from datetime import datetime, timedelta
@@ -35,6 +35,7 @@ class CircuitBreakerConfig:
     failure_threshold: int = 5
     recovery_timeout: int = 300  # seconds
     half_open_max_requests: int = 3
+    expected_exceptions: Tuple[Type[BaseException], ...] = (Exception,)
 
 class RateLimiter:
     """Implements token bucket rate limiting algorithm."""
@@ -156,7 +157,7 @@ class CircuitBreaker:
             result = await func(*args, **kwargs)
             await self.record_success()
             return result
-        except Exception as e:
+        except self.config.expected_exceptions as e:
             await self.record_failure(e)
             if self.state == "OPEN":
                 raise CircuitOpenError(f"Circuit breaker for {self.name} is open") from e
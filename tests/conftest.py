@@ -2,8 +2,10 @@
 Pytest configuration and fixtures for IPO Reminder tests.
 """
 import pytest
+import pytest_asyncio
 import asyncio
 import os
+import tempfile
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -17,6 +19,16 @@ os.environ['DATABASE_URL'] = 'sqlite+aiosqlite:///:memory:'
 os.environ['REDIS_URL'] = 'redis://localhost:6379/1'
 os.environ['BSE_API_KEY'] = 'test_bse_key'
 os.environ['NSE_API_KEY'] = 'test_nse_key'
+# Keep log files written during the run out of the source tree
+_LOG_DIR = tempfile.mkdtemp(prefix='ipo_reminder_test_logs_')
+os.environ['LOG_FILE'] = os.path.join(_LOG_DIR, 'ipo_reminder.log')
+
+@pytest.fixture(scope="session", autouse=True)
+def email_log_file():
+    """Write the email delivery log into the test log directory."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr('ipo_reminder.emailer.EMAIL_LOG_FILE', os.path.join(_LOG_DIR, 'email.log'))
+        yield
 
 # Pytest event loop policy for async tests
 @pytest.fixture(scope="session")
@@ -28,6 +40,24 @@ def event_loop():
     loop.close()
 
 # Common fixtures
+@pytest_asyncio.fixture
+async def sqlite_db_manager(monkeypatch):
+    """A DatabaseManager backed by a fresh in-memory SQLite database, without Redis."""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import StaticPool
+    from ipo_reminder.database import Base, DatabaseManager
+
+    monkeypatch.setattr('ipo_reminder.database.REDIS_URL', '')
+    manager = DatabaseManager()
+    manager.engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    manager.async_session_factory = async_sessionmaker(
+        bind=manager.engine, class_=AsyncSession, expire_on_commit=False
+    )
+    async with manager.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield manager
+    await manager.close()
+
 @pytest.fixture
 def mock_db_session():
     """Mock database session."""
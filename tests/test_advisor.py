@@ -0,0 +1,53 @@
+import pytest
+from ipo_reminder.advisor import (
+    RECOMMENDATION_ORDER,
+    SECTOR_KEYWORDS,
+    TECH_BONUS,
+    TECH_BONUS_KEYWORDS,
+    PersonalIPOAdvisor,
+    get_personalized_recommendations,
+    match_sectors,
+)
+from ipo_reminder.sources.chittorgarh import IPOInfo
+
+
+def _substring_sectors(name):
+    """Reference implementation: plain substring checks per keyword."""
+    sectors = {s for s, keywords in SECTOR_KEYWORDS.items() if any(k in name for k in keywords)}
+    if any(k in name for k in TECH_BONUS_KEYWORDS):
+        sectors.add(TECH_BONUS)
+    return sectors
+
+@pytest.mark.parametrize("name", [
+    "tata technologies ltd",
+    "drug pharmaceutical labs",
+    "jaipur coal mining",
+    "green energy solar power",
+    "plain industries",
+    "",
+])
+def test_match_sectors_matches_substring_scan(name):
+    assert match_sectors(name) == _substring_sectors(name)
+
+def test_match_sectors_reports_prefix_keywords():
+    # 'pharmaceutical' is the longest match but 'pharma' also occurs there
+    assert {'healthcare', 'pharmaceuticals'} <= match_sectors("pharmaceutical")
+
+def test_analyze_sector_avoid_overrides_preferred():
+    score, reasoning = PersonalIPOAdvisor()._analyze_sector("Coal Bank Ltd")
+    assert score == 0.2
+    assert any("Coal" in line or "Mining" in line for line in reasoning)
+
+@pytest.mark.parametrize("min_recommendation", ["STRONG BUY", "BUY", "APPLY", "NEUTRAL", "AVOID"])
+def test_min_recommendation_matches_filtering_full_results(min_recommendation):
+    ipos = [
+        IPOInfo(name=name, detail_url=None, gmp_url=None, open_date=None, close_date=None,
+                price_band=price_band, lot_size=None, issue_size=issue_size)
+        for name in ["Coal Mining Ltd", "Tata Technologies", "Beer Digital (SME)", "Plain Ltd"]
+        for price_band, issue_size in [("₹100-120", "₹500 Cr"), ("₹2500-2600", "20 Cr"), (None, None)]
+    ]
+    floor = RECOMMENDATION_ORDER[min_recommendation]
+    expected = [r for r in get_personalized_recommendations(ipos)
+                if RECOMMENDATION_ORDER[r.recommendation] >= floor]
+
+    assert get_personalized_recommendations(ipos, min_recommendation=min_recommendation) == expected
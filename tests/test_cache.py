@@ -95,3 +95,307 @@ class TestCacheManager:
         cache_manager.redis.get.return_value = '{"key": "value", "nested": {"a": 1, "b": [1, 2, 3]}}'
         value = await cache_manager.get("complex_key")
         assert value == test_data
+
+
+class TestCacheSerialization:
+    """Round-trip tests for the tagged cache serialization format."""
+
+    @pytest.fixture
+    def cache_manager(self):
+        from ipo_reminder.cache import CacheManager
+        # Nothing listens on port 1, so the manager falls back to memory only
+        return CacheManager(redis_url="redis://localhost:1/0")
+
+    def test_round_trip_uses_msgpack(self, cache_manager):
+        from ipo_reminder.cache import MSGPACK_TAG
+
+        test_data = {"key": "value", "nested": {"a": 1, "b": [1, 2, 3]}}
+        serialized = cache_manager._serialize_value(test_data)
+
+        assert serialized[:1] == MSGPACK_TAG
+        assert cache_manager._deserialize_value(serialized) == test_data
+
+    def test_unsupported_type_falls_back_to_json(self, cache_manager):
+        from ipo_reminder.cache import JSON_TAG
+
+        serialized = cache_manager._serialize_value({"obj": object()})
+
+        assert serialized[:1] == JSON_TAG
+        assert "obj" in cache_manager._deserialize_value(serialized)
+
+    def test_round_trip_keeps_dates_and_registered_dataclasses(self, cache_manager):
+        from dataclasses import dataclass
+        from datetime import date, datetime
+        from typing import Optional
+
+        from ipo_reminder.cache import register_cache_type
+
+        # Shaped like official_apis.OfficialIPOData, the @cache_ipo_data result type
+        @register_cache_type
+        @dataclass
+        class CachedIPO:
+            symbol: str
+            min_price: Optional[float]
+            open_date: Optional[date]
+            listing_date: Optional[date]
+
+        ipo = CachedIPO("TST", 100.0, date(2026, 1, 1), None)
+        value = {"ipos": [ipo], "fetched_at": datetime(2026, 1, 1, 9, 30)}
+
+        restored = cache_manager._deserialize_value(cache_manager._serialize_value(value))
+
+        assert restored == value
+        assert isinstance(restored["ipos"][0], CachedIPO)
+        assert type(restored["ipos"][0].open_date) is date
+        assert type(restored["fetched_at"]) is datetime
+
+    def test_unregistered_dataclass_round_trips_as_dict(self, cache_manager):
+        from dataclasses import dataclass
+        from datetime import date
+
+        @dataclass
+        class Listing:
+            symbol: str
+            listed_on: date
+
+        restored = cache_manager._deserialize_value(
+            cache_manager._serialize_value(Listing("TST", date(2026, 1, 10)))
+        )
+
+        assert restored == {"symbol": "TST", "listed_on": date(2026, 1, 10)}
+
+    def test_untagged_legacy_entry_is_a_miss(self, cache_manager):
+        assert cache_manager._deserialize_value(b"\x80\x04legacy-pickle") is None
+
+    def test_mset_mget_memory_fallback(self, cache_manager):
+        assert cache_manager.mset({"a": 1, "b": [2, 3]}, ttl_seconds=60, namespace="ns")
+
+        assert cache_manager.mget(["a", "b", "missing"], namespace="ns") == {"a": 1, "b": [2, 3]}
+
+    def test_clear_namespace_removes_hashed_memory_keys(self, cache_manager):
+        cache_manager.mset({"a": 1, "b": 2}, namespace="ns")
+        cache_manager.mset({"a": 3}, namespace="other")
+
+        assert cache_manager.clear_namespace("ns") == 2
+        assert cache_manager.mget(["a", "b"], namespace="ns") == {}
+        assert cache_manager.mget(["a"], namespace="other") == {"a": 3}
+
+    def test_memory_cache_evicts_least_recently_used(self):
+        from ipo_reminder.cache import CacheManager
+
+        cache_manager = CacheManager(redis_url="redis://localhost:1/0", max_entries=2)
+        cache_manager.mset({"a": 1, "b": 2})
+        assert cache_manager.get("a") == 1  # "b" is now least recently used
+        cache_manager.mset({"c": 3})
+
+        assert cache_manager.mget(["a", "b", "c"]) == {"a": 1, "c": 3}
+
+    def test_memory_cache_respects_byte_limit(self):
+        from ipo_reminder.cache import CacheManager
+
+        cache_manager = CacheManager(redis_url="redis://localhost:1/0", max_bytes=150)
+        cache_manager.mset({"a": "x" * 100})
+        cache_manager.mset({"b": "y" * 100})
+
+        assert cache_manager.mget(["a", "b"]) == {"b": "y" * 100}
+        assert cache_manager.memory_bytes <= 150
+
+    def test_memory_only_written_when_redis_write_fails(self, cache_manager):
+        from unittest.mock import MagicMock
+
+        cache_manager.redis_client = MagicMock()
+        cache_manager.redis_client.get.return_value = None
+        assert cache_manager._store("ok", 1)
+        assert "ok" not in cache_manager.memory_cache
+
+        cache_manager.redis_client.pipeline.return_value.execute.side_effect = ConnectionError("down")
+        assert cache_manager._store("failed", 2)
+        assert cache_manager.get("failed") == 2
+
+    def test_memory_fallback_read_when_redis_is_down(self, cache_manager):
+        from unittest.mock import MagicMock
+
+        import redis
+
+        cache_manager.redis_client = MagicMock()
+        cache_manager.redis_client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+        cache_manager.redis_client.get.side_effect = redis.ConnectionError("down")
+        cache_manager.redis_client.mget.side_effect = redis.ConnectionError("down")
+
+        assert cache_manager._store("a", 1, namespace="ns")
+        assert cache_manager.mset({"b": 2}, namespace="ns")
+
+        assert cache_manager.get("a", namespace="ns") == 1
+        assert cache_manager.mget(["a", "b", "missing"], namespace="ns") == {"a": 1, "b": 2}
+
+    def test_namespace_index_expires_with_longest_ttl(self, cache_manager):
+        from unittest.mock import MagicMock, call
+
+        cache_manager.redis_client = MagicMock()
+        pipe = cache_manager.redis_client.pipeline.return_value
+
+        cache_manager._store("long", 1, ttl_seconds=600, namespace="ns")
+        cache_manager._store("short", 2, ttl_seconds=60, namespace="ns")
+
+        index_key = cache_manager._namespace_index("ns")
+        assert pipe.expire.call_args_list == [call(index_key, 600), call(index_key, 600)]
+
+    def test_health_check_sweeps_only_expired_entries(self, cache_manager):
+        cache_manager.mset({"short": 1}, ttl_seconds=0)
+        cache_manager.mset({"long": 2}, ttl_seconds=60)
+        cache_manager.mset({"short": 3}, ttl_seconds=60)  # replaced before it expired
+
+        cache_manager.health_check()
+
+        assert cache_manager.mget(["short", "long"]) == {"short": 3, "long": 2}
+
+
+class TestCachedDecorator:
+    """Tests for the in-process memo in front of the cache manager."""
+
+    def test_repeated_call_is_served_from_memo(self):
+        from ipo_reminder.cache import cached, cache_manager
+
+        calls = []
+
+        @cached(ttl_seconds=60, namespace="test_memo")
+        def square(x):
+            calls.append(x)
+            return x * x
+
+        assert square(3) == 9
+        with patch.object(cache_manager, "get") as get:
+            assert square(3) == 9
+            get.assert_not_called()
+        assert calls == [3]
+
+    def test_clear_namespace_empties_memo(self):
+        from ipo_reminder.cache import cached, cache_manager
+
+        calls = []
+
+        @cached(ttl_seconds=60, namespace="test_memo_clear")
+        def double(x):
+            calls.append(x)
+            return x * 2
+
+        double(2)
+        cache_manager.clear_namespace("test_memo_clear")
+        double(2)
+
+        assert calls == [2, 2]
+
+    def test_memo_returns_copies(self):
+        from ipo_reminder.cache import cached
+
+        @cached(ttl_seconds=60, namespace="test_memo_copies")
+        def listing(x):
+            return {"items": [x]}
+
+        listing(1)["items"].append("mutated")
+        assert listing(1) == {"items": [1]}
+        listing(1)["items"].clear()
+        assert listing(1) == {"items": [1]}
+
+    def test_memo_serializes_once_and_never_deserializes(self):
+        from ipo_reminder.cache import cached, cache_manager
+
+        @cached(ttl_seconds=60, namespace="test_memo_serialize")
+        def listing(x):
+            return [{"symbol": x}]
+
+        with patch.object(cache_manager, "_serialize_value",
+                          wraps=cache_manager._serialize_value) as serialize, \
+             patch.object(cache_manager, "_deserialize_value") as deserialize:
+            assert listing("TST") == [{"symbol": "TST"}]
+            assert listing("TST") == [{"symbol": "TST"}]
+
+        # Only the cache manager's write serializes; the memo fill and hit don't
+        assert serialize.call_count == 1
+        deserialize.assert_not_called()
+
+    def test_memo_copies_dataclass_results(self):
+        from dataclasses import dataclass, field
+
+        from ipo_reminder.cache import cached
+
+        @dataclass
+        class Listing:
+            symbol: str
+            tags: list = field(default_factory=list)
+
+        @cached(ttl_seconds=60, namespace="test_memo_dataclass")
+        def listing(symbol):
+            return [Listing(symbol)]
+
+        listing("TST")[0].tags.append("mutated")
+        first, second = listing("TST")[0], listing("TST")[0]
+        assert first == Listing("TST")
+        assert first is not second and first.tags is not second.tags
+
+    def test_delete_evicts_memo(self):
+        from ipo_reminder.cache import cached, cache_manager
+
+        calls = []
+
+        @cached(ttl_seconds=60, namespace="test_memo_delete")
+        def triple(x):
+            calls.append(x)
+            return x * 3
+
+        triple(2)
+        cache_manager.delete(repr((triple.__qualname__, (2,), ())), "test_memo_delete")
+        triple(2)
+
+        assert calls == [2, 2]
+
+    def test_memo_expires_before_ttl(self):
+        from ipo_reminder.cache import cached, cache_manager
+
+        @cached(ttl_seconds=60, namespace="test_memo_expiry")
+        def negate(x):
+            return -x
+
+        # Each call rechecks the shared cache, which another process may have changed
+        with patch("ipo_reminder.cache.MEMO_TTL_SECONDS", 0), \
+             patch.object(cache_manager, "get", return_value=-40) as get:
+            negate(5)
+            assert negate(5) == -40
+            assert get.call_count == 2
+
+    def test_memo_does_not_keep_instances_alive(self):
+        import gc
+        import weakref
+        from ipo_reminder.cache import cached
+
+        class Service:
+            @cached(ttl_seconds=60, namespace="test_memo_weak")
+            def lookup(self, x):
+                return x + 1
+
+        service = Service()
+        assert service.lookup(1) == 2
+        assert service.lookup(1) == 2
+        ref = weakref.ref(service)
+        del service
+        gc.collect()
+
+        assert ref() is None
+
+    def test_memo_is_safe_across_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        from ipo_reminder.cache import cached
+
+        @cached(ttl_seconds=60, namespace="test_memo_threads")
+        def increment(x):
+            return x + 1
+
+        # Expired entries and constant eviction put every thread on the
+        # del / move_to_end / popitem paths at once
+        with patch("ipo_reminder.cache.MEMO_TTL_SECONDS", 0), \
+             patch("ipo_reminder.cache.MEMO_MAX_ENTRIES", 2), \
+             ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda i: increment(i % 4), range(2000)))
+
+        assert results == [i % 4 + 1 for i in range(2000)]
@@ -0,0 +1,119 @@
+"""Tests for the compliance module."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from ipo_reminder.compliance import AuditEvent, AuditEventType, ComplianceLevel, ComplianceLogger
+from ipo_reminder.database import AuditLog
+
+
+class TestAuditEvent:
+    """Test cases for the AuditEvent dataclass."""
+
+    def test_events_compare_by_value(self):
+        """Events with the same fields are equal; any differing field makes them unequal."""
+        fields = dict(
+            event_id='evt-1', event_type=AuditEventType.API_CALL, timestamp=datetime(2024, 1, 2),
+            user_id=None, session_id=None, resource='api:bse', action='call', status='SUCCESS',
+            details={}, compliance_level=ComplianceLevel.LOW, ip_address=None, user_agent=None,
+            checksum=None,
+        )
+
+        assert AuditEvent(**fields) == AuditEvent(**fields)
+        assert AuditEvent(**fields) != AuditEvent(**{**fields, 'status': 'FAILURE'})
+
+
+class TestComplianceLogger:
+    """Test cases for the ComplianceLogger class."""
+
+    @pytest.mark.asyncio
+    async def test_events_are_persisted(self, sqlite_db_manager):
+        """Queued events of every level are written as AuditLog rows."""
+        compliance = ComplianceLogger(db=sqlite_db_manager)
+        await compliance.log_ipo_data_fetch('bse', 3, 'SUCCESS')
+        await compliance.log_email_send('someone@example.com', 'IPO Reminder', 'SUCCESS')
+        await compliance.log_error('email_send', 'timed out')
+        await compliance.flush()
+
+        async with sqlite_db_manager.get_session() as session:
+            rows = (await session.execute(
+                select(AuditLog).order_by(AuditLog.created_at)
+            )).scalars().all()
+
+        assert [row.event_type for row in rows] == ['ipo_data_fetch', 'email_send', 'error_occurred']
+        fetch, email, error = rows
+        assert fetch.action == 'ipo_data_fetch:fetch'
+        assert (fetch.entity_type, fetch.entity_id) == ('ipo_data', 'bse')
+        assert fetch.new_values['details'] == {'source': 'bse', 'record_count': 3}
+        assert email.entity_id == 'someone@example.com'
+        assert email.new_values['compliance_level'] == 'high'
+        assert error.status == 'FAILURE'
+        assert all(row.request_id and row.new_values['checksum'] for row in rows)
+
+    @pytest.mark.asyncio
+    async def test_critical_events_are_committed_immediately(self, sqlite_db_manager):
+        """CRITICAL events are in the table once log_event returns, without a flush."""
+        compliance = ComplianceLogger(db=sqlite_db_manager)
+        await compliance.log_security_event('rate_limit', {'ip': '10.0.0.1'})
+
+        async with sqlite_db_manager.get_session() as session:
+            rows = (await session.execute(select(AuditLog))).scalars().all()
+
+        assert [row.event_type for row in rows] == ['security_event']
+        assert rows[0].new_values['compliance_level'] == 'critical'
+
+    @pytest.mark.asyncio
+    async def test_audit_trail_filters(self, sqlite_db_manager):
+        """The trail filters on resource prefix and event type."""
+        compliance = ComplianceLogger(db=sqlite_db_manager)
+        await compliance.log_api_call('bse', 'upcoming_ipos', 'SUCCESS')
+        await compliance.log_api_call('nse', 'upcoming_ipos', 'FAILURE')
+        await compliance.log_email_send('someone@example.com', 'IPO Reminder', 'SUCCESS')
+
+        bse_calls = await compliance.get_audit_trail(resource='api:bse')
+        assert [log['entity_id'] for log in bse_calls] == ['bse:upcoming_ipos']
+        assert len(await compliance.get_audit_trail(resource='api')) == 2
+        emails = await compliance.get_audit_trail(event_type=AuditEventType.EMAIL_SEND)
+        assert [log['entity_id'] for log in emails] == ['someone@example.com']
+
+    @pytest.mark.asyncio
+    async def test_compliance_report_counts(self, sqlite_db_manager):
+        """The report counts events in the period by type and status."""
+        compliance = ComplianceLogger(db=sqlite_db_manager)
+        await compliance.log_api_call('bse', 'upcoming_ipos', 'SUCCESS')
+        await compliance.log_api_call('nse', 'upcoming_ipos', 'FAILURE')
+        await compliance.log_security_event('rate_limit', {'ip': '10.0.0.1'})
+        start = datetime.utcnow() - timedelta(minutes=1)
+
+        report = await compliance.generate_compliance_report(
+            start, datetime.utcnow() + timedelta(minutes=1), include_details=True
+        )
+
+        assert report['summary'] == {
+            'total_events': 3,
+            'events_by_type': {'api_call': 2, 'security_event': 1},
+            'events_by_status': {'SUCCESS': 1, 'FAILURE': 1, 'WARNING': 1},
+            'compliance_violations': 1,
+            'security_events': 1,
+        }
+        assert len(report['details']) == 3
+        empty = await compliance.generate_compliance_report(start - timedelta(days=2), start)
+        assert empty['summary']['total_events'] == 0
+
+    @pytest.mark.asyncio
+    async def test_cleanup_removes_expired_logs(self, sqlite_db_manager, monkeypatch):
+        """Rows older than the retention period are deleted in chunks."""
+        monkeypatch.setattr('ipo_reminder.compliance.AUDIT_CLEANUP_BATCH_SIZE', 2)
+        now = datetime.utcnow()
+        await sqlite_db_manager.bulk_insert_audit(
+            [{'action': 'old', 'created_at': now - timedelta(days=400)} for _ in range(5)]
+            + [{'action': 'recent', 'created_at': now - timedelta(days=10)}]
+        )
+        compliance = ComplianceLogger(db=sqlite_db_manager)
+
+        assert await compliance.cleanup_old_logs() == 5
+
+        async with sqlite_db_manager.get_session() as session:
+            remaining = (await session.execute(select(AuditLog.action))).scalars().all()
+        assert remaining == ['recent']
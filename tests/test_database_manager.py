@@ -1,16 +1,29 @@
 """Tests for DatabaseManager class."""
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, patch, MagicMock
+import contextlib
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy import inspect, select, text, update
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
-from ipo_reminder.database import DatabaseManager, IPOData, SystemConfig
-from ipo_reminder.exceptions import DBConnectionError, NotFoundError
+from ipo_reminder.config import CONFIG
+from ipo_reminder.database import DB_MAX_CONCURRENCY, AuditLog, DatabaseManager, IPOData, SystemConfig, SystemMetrics, _server_computed_attrs
+from ipo_reminder.exceptions import ConnectionError as DBConnectionError, DatabaseError, NotFoundError
 
 @pytest.fixture
 def db_manager():
     """Fixture to provide a DatabaseManager instance."""
     return DatabaseManager()
 
+@pytest.fixture
+def mock_session(db_manager):
+    """An AsyncSession stand-in handed out by db_manager's session factory."""
+    session = AsyncMock()
+    session.add = MagicMock()  # AsyncSession.add is synchronous
+    session.info = {}
+    db_manager.async_session_factory = MagicMock(return_value=session)
+    return session
+
 @pytest.fixture
 def sample_ipo_data():
     """Sample IPO data for testing."""
@@ -25,104 +38,105 @@ class TestDatabaseManager:
     """Test cases for DatabaseManager class."""
     
     @pytest.mark.asyncio
-    async def test_get_session_success(self, db_manager):
+    async def test_get_session_success(self, db_manager, mock_session):
         """Test successful session creation."""
-        mock_session = AsyncMock()
-        db_manager.async_session_factory = MagicMock(return_value=mock_session)
-        
         async with db_manager.get_session() as session:
             assert session == mock_session
             
+        mock_session.commit.assert_awaited_once()
         mock_session.close.assert_awaited_once()
         
     @pytest.mark.asyncio
-    async def test_get_session_connection_error(self, db_manager):
+    async def test_get_session_connection_error(self, db_manager, mock_session):
         """Test session creation with connection error."""
-        mock_session = AsyncMock()
         mock_session.connection.side_effect = OperationalError("Connection failed", [], None)
-        db_manager.async_session_factory = MagicMock(return_value=mock_session)
         
         with pytest.raises(DBConnectionError):
-            async with db_manager.get_session():
-                pass
+            async with db_manager.get_session() as session:
+                await session.connection()
                 
         mock_session.rollback.assert_awaited_once()
         mock_session.close.assert_awaited_once()
     
+    def test_session_limit_within_pool_capacity(self, db_manager):
+        """Server databases cap open sessions at no more than the pool can hand out."""
+        db_manager.engine = MagicMock()
+        db_manager.engine.dialect.name = 'postgresql'
+        
+        limit = db_manager._session_limit()
+        
+        assert isinstance(limit, asyncio.Semaphore)
+        assert limit._value == DB_MAX_CONCURRENCY
+        assert DB_MAX_CONCURRENCY <= CONFIG["DB_POOL_SIZE"] + CONFIG["DB_MAX_OVERFLOW"]
+        
     @pytest.mark.asyncio
-    async def test_create_success(self, db_manager, sample_ipo_data):
+    async def test_create_success(self, db_manager, mock_session, sample_ipo_data):
         """Test successful record creation."""
-        mock_session = AsyncMock()
+        result = await db_manager.create(IPOData, **sample_ipo_data)
         
-        with patch.object(db_manager, 'get_session', return_value=mock_session):
-            result = await db_manager.create(IPOData, **sample_ipo_data)
-            
         assert result is not None
         mock_session.add.assert_called_once()
-        mock_session.commit.assert_awaited_once()
-        mock_session.refresh.assert_awaited_once()
+        mock_session.flush.assert_awaited_once()
+        mock_session.refresh.assert_not_awaited()
+        
+    @pytest.mark.asyncio
+    async def test_create_with_refresh(self, db_manager, mock_session, sample_ipo_data):
+        """refresh=True reloads only the server-computed columns."""
+        result = await db_manager.create(IPOData, refresh=True, **sample_ipo_data)
+        
+        mock_session.refresh.assert_awaited_once_with(result, _server_computed_attrs(IPOData))
+        assert 'created_at' in _server_computed_attrs(IPOData)
+        assert 'company_name' not in _server_computed_attrs(IPOData)
         
     @pytest.mark.asyncio
-    async def test_get_success(self, db_manager):
+    async def test_get_success(self, db_manager, mock_session):
         """Test successful record retrieval."""
         mock_ipo = MagicMock()
-        mock_session = AsyncMock()
         mock_session.get.return_value = mock_ipo
         
-        with patch.object(db_manager, 'get_session', return_value=mock_session):
-            result = await db_manager.get(IPOData, 1)
-            
+        result = await db_manager.get(IPOData, 1)
+        
         assert result == mock_ipo
         mock_session.get.assert_called_once_with(IPOData, 1)
         
     @pytest.mark.asyncio
-    async def test_get_not_found(self, db_manager):
+    async def test_get_not_found(self, db_manager, mock_session):
         """Test record not found scenario."""
-        mock_session = AsyncMock()
         mock_session.get.return_value = None
         
-        with patch.object(db_manager, 'get_session', return_value=mock_session):
-            with pytest.raises(NotFoundError):
-                await db_manager.get(IPOData, 999)
+        with pytest.raises(NotFoundError):
+            await db_manager.get(IPOData, 999)
     
     @pytest.mark.asyncio
-    async def test_update_success(self, db_manager):
+    async def test_update_success(self, db_manager, mock_session):
         """Test successful record update."""
         mock_ipo = MagicMock()
-        mock_session = AsyncMock()
         
-        with patch.object(db_manager, 'get_session', return_value=mock_session):
-            result = await db_manager.update(mock_ipo, status='closed')
-            
+        result = await db_manager.update(mock_ipo, status='closed')
+        
         assert result == mock_ipo
         mock_session.add.assert_called_once_with(mock_ipo)
-        mock_session.commit.assert_awaited_once()
-        mock_session.refresh.assert_awaited_once_with(mock_ipo)
+        mock_session.flush.assert_awaited_once()
+        mock_session.refresh.assert_not_awaited()
         
     @pytest.mark.asyncio
-    async def test_delete_success(self, db_manager):
+    async def test_delete_success(self, db_manager, mock_session):
         """Test successful record deletion."""
         mock_ipo = MagicMock()
-        mock_session = AsyncMock()
         
-        with patch.object(db_manager, 'get_session', return_value=mock_session):
-            result = await db_manager.delete(mock_ipo)
-            
+        result = await db_manager.delete(mock_ipo)
+        
         assert result is True
         mock_session.delete.assert_called_once_with(mock_ipo)
-        mock_session.commit.assert_awaited_once()
+        mock_session.flush.assert_awaited_once()
         
     @pytest.mark.asyncio
-    async def test_initialize_config(self, db_manager):
+    async def test_initialize_config(self, db_manager, mock_session):
         """Test system configuration initialization."""
-        mock_session = AsyncMock()
-        mock_session.execute.return_value = MagicMock(scalar_one_or_none=lambda: None)
+        await db_manager._initialize_config()
         
-        with patch.object(db_manager, 'get_session', return_value=mock_session):
-            await db_manager._initialize_config()
-            
-        # Verify that config items were added
-        assert mock_session.add.call_count > 0
+        # Verify that all config items were upserted in one statement
+        mock_session.execute.assert_awaited_once()
         mock_session.commit.assert_awaited_once()
         
     @pytest.mark.asyncio
@@ -150,3 +164,186 @@ class TestDatabaseManager:
         assert stats['connection_count'] == 2
         assert stats['pool_size'] == 5
         assert 'url' in stats
+
+
+def _ipo_rows(count):
+    return [
+        {'company_name': f'Company {i}', 'symbol': f'C{i}', 'source': 'test'}
+        for i in range(count)
+    ]
+
+class TestDatabaseManagerSQLite:
+    """DatabaseManager against a real in-memory SQLite database."""
+
+    @pytest.mark.asyncio
+    async def test_unit_of_work_commits_once(self, sqlite_db_manager):
+        """CRUD calls given the unit of work's session commit together on exit."""
+        db = sqlite_db_manager
+        async with db.unit_of_work() as session:
+            ipo = await db.create(IPOData, session=session, **_ipo_rows(1)[0])
+            await db.update(ipo, session=session, status='Open')
+            assert ipo.id is not None
+
+        assert (await db.get(IPOData, ipo.id)).status == 'Open'
+
+    @pytest.mark.asyncio
+    async def test_unit_of_work_rolls_back_on_error(self, sqlite_db_manager):
+        """Nothing from a failed unit of work is committed."""
+        db = sqlite_db_manager
+        # Unexpected errors surface as DatabaseError once the session rolls back
+        with pytest.raises(DatabaseError):
+            async with db.unit_of_work() as session:
+                await db.create(IPOData, session=session, **_ipo_rows(1)[0])
+                raise RuntimeError("abort")
+
+        assert await db.get_all(IPOData) == []
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_and_delete(self, sqlite_db_manager):
+        """bulk_update and bulk_delete touch only the given ids and return row counts."""
+        db = sqlite_db_manager
+        assert await db.bulk_insert(IPOData, _ipo_rows(4)) == 4
+        ids = sorted(ipo.id for ipo in await db.get_all(IPOData))
+
+        assert await db.bulk_update(IPOData, ids[:2], status='Closed') == 2
+        assert await db.bulk_delete(IPOData, ids[3:]) == 1
+        assert await db.bulk_update(IPOData, [], status='Closed') == 0
+
+        remaining = {ipo.id: ipo.status for ipo in await db.get_all(IPOData)}
+        assert set(remaining) == set(ids[:3])
+        assert [remaining[i] for i in ids[:2]] == ['Closed', 'Closed']
+        assert remaining[ids[2]] != 'Closed'
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_every_row_in_chunks(self, sqlite_db_manager):
+        """stream and stream_all yield all matching rows with small fetch batches."""
+        db = sqlite_db_manager
+        await db.bulk_insert(IPOData, _ipo_rows(5))
+
+        symbols = [ipo.symbol async for ipo in db.stream(
+            select(IPOData).order_by(IPOData.id), chunk_size=2
+        )]
+        assert symbols == ['C0', 'C1', 'C2', 'C3', 'C4']
+        matching = [ipo async for ipo in db.stream_all(IPOData, batch_size=2, symbol='C3')]
+        assert [ipo.company_name for ipo in matching] == ['Company 3']
+
+    @pytest.mark.asyncio
+    async def test_initialize_config_is_idempotent(self, sqlite_db_manager):
+        """Seeding twice keeps one row per key and leaves edited values alone."""
+        db = sqlite_db_manager
+        await db._initialize_config()
+        async with db.get_session() as session:
+            await session.execute(
+                update(SystemConfig).where(SystemConfig.key == 'cache_enabled').values(value='false')
+            )
+
+        await db._initialize_config()
+
+        configs = {config.key: config.value for config in await db.get_all(SystemConfig)}
+        assert len(configs) == 10
+        assert configs['cache_enabled'] == 'false'
+
+    @pytest.mark.asyncio
+    async def test_initialize_config_without_on_conflict(self, sqlite_db_manager, monkeypatch):
+        """Dialects without ON CONFLICT look up existing keys and add only the missing ones."""
+        db = sqlite_db_manager
+        monkeypatch.setattr('ipo_reminder.database._CONFLICT_INSERTS', {})
+        await db.create(SystemConfig, key='cache_enabled', value='false')
+
+        await db._initialize_config()
+        await db._initialize_config()
+
+        configs = {config.key: config.value for config in await db.get_all(SystemConfig)}
+        assert len(configs) == 10
+        assert configs['cache_enabled'] == 'false'
+
+    @pytest.mark.asyncio
+    async def test_create_refresh_loads_server_defaults(self, sqlite_db_manager):
+        """The INSERT assigns the id; refresh=True loads the server-side timestamps."""
+        config = await sqlite_db_manager.create(
+            SystemConfig, refresh=True, key='feature_flag', value='on'
+        )
+
+        assert config.id is not None
+        assert config.created_at is not None and config.updated_at is not None
+
+    @pytest.mark.asyncio
+    async def test_sessions_are_not_capped(self, sqlite_db_manager):
+        """SQLite skips the session semaphore, so nested sessions beyond the cap still open."""
+        assert not isinstance(sqlite_db_manager._session_limit(), asyncio.Semaphore)
+
+        async with contextlib.AsyncExitStack() as stack:
+            for _ in range(DB_MAX_CONCURRENCY + 1):
+                await stack.enter_async_context(sqlite_db_manager.get_session())
+
+    @pytest.mark.asyncio
+    async def test_initialize_upgrades_existing_tables(self, sqlite_db_manager):
+        """initialize() adds columns and indexes missing from tables an older release created."""
+        db = sqlite_db_manager
+        async with db.engine.begin() as conn:
+            # audit_logs as it was before event_type existed
+            await conn.execute(text("DROP INDEX ix_audit_logs_created_at_event_type_status"))
+            await conn.execute(text("ALTER TABLE audit_logs DROP COLUMN event_type"))
+            await conn.execute(text("INSERT INTO audit_logs (action) VALUES ('legacy')"))
+
+        await db.initialize()
+
+        async with db.engine.connect() as conn:
+            columns, indexes = await conn.run_sync(lambda sync_conn: (
+                {column['name'] for column in inspect(sync_conn).get_columns('audit_logs')},
+                {index['name'] for index in inspect(sync_conn).get_indexes('audit_logs')},
+            ))
+        assert 'event_type' in columns
+        assert 'ix_audit_logs_created_at_event_type_status' in indexes
+        await db.bulk_insert_audit([{'action': 'new', 'event_type': 'email_send'}])
+        async with db.get_session() as session:
+            rows = (await session.execute(
+                select(AuditLog.action, AuditLog.event_type).order_by(AuditLog.id)
+            )).all()
+        assert rows == [('legacy', None), ('new', 'email_send')]
+
+    @pytest.mark.asyncio
+    async def test_initialize_seeds_system_config(self, sqlite_db_manager):
+        """initialize() fills in the default system configuration."""
+        await sqlite_db_manager.initialize()
+
+        configs = {config.key for config in await sqlite_db_manager.get_all(SystemConfig)}
+        assert {'system_version', 'database_version', 'data_retention_days'} <= configs
+
+    @pytest.mark.asyncio
+    async def test_prune_deletes_rows_from_unpartitioned_tables(self, sqlite_db_manager, monkeypatch):
+        """Time-series tables created before partitioning fall back to deleting expired rows."""
+        db = sqlite_db_manager
+        monkeypatch.setattr('ipo_reminder.database.PARTITION_TIME_SERIES', True)
+        db._is_partitioned = AsyncMock(return_value=False)
+        now = datetime.utcnow()
+        await db.bulk_insert_audit([
+            {'action': 'old', 'created_at': now - timedelta(days=40)},
+            {'action': 'recent', 'created_at': now - timedelta(days=1)},
+        ])
+        await db.bulk_insert(SystemMetrics, [
+            {'metric_name': 'old', 'metric_value': 1.0, 'metric_type': 'GAUGE',
+             'timestamp': now - timedelta(days=40)},
+        ])
+
+        pruned = await db.prune_time_series(metrics_retention_days=30, audit_retention_days=30)
+
+        assert pruned == {'system_metrics': 1, 'audit_logs': 1}
+        assert [log.action for log in await db.get_all(AuditLog)] == ['recent']
+
+    @pytest.mark.asyncio
+    async def test_audit_queue_drops_but_compliance_queue_waits(self, sqlite_db_manager, monkeypatch):
+        """log_audit drops rows past its bound; log_compliance_audit waits for room."""
+        db = sqlite_db_manager
+        monkeypatch.setattr('ipo_reminder.database.WRITE_QUEUE_MAX_SIZE', 2)
+        monkeypatch.setattr('ipo_reminder.database.COMPLIANCE_WRITE_QUEUE_MAX_SIZE', 2)
+
+        queued = [db.log_audit(action='ordinary') for _ in range(3)]
+        for _ in range(5):
+            await db.log_compliance_audit(action='compliance')
+        await db.flush_writes()
+
+        assert queued == [True, True, False]
+        actions = [log.action for log in await db.get_all(AuditLog)]
+        assert actions.count('ordinary') == 2
+        assert actions.count('compliance') == 5
@@ -1,8 +1,15 @@
 """Tests for the emailer module."""
+import asyncio
+
+import smtplib
+
+import aiosmtplib
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from email.mime.multipart import MIMEMultipart
 
+from ipo_reminder import emailer as emailer_module
+
 class TestEmailer:
     """Test cases for the Emailer class."""
     
@@ -132,3 +139,187 @@ class TestEmailer:
         await emailer.close()
         
         emailer.server.quit.assert_awaited_once()
+
+
+class TestSendEmail:
+    """Test cases for the blocking send_email function."""
+
+    @pytest.fixture
+    def smtp(self, monkeypatch):
+        """A real, unconnected smtplib.SMTP that records the payload it would send."""
+        monkeypatch.setenv('SENDER_EMAIL', 'sender@example.com')
+        monkeypatch.setenv('SENDER_PASSWORD', 'secret')
+        smtp = smtplib.SMTP()
+        smtp.esmtp_features = {'8bitmime': ''}
+        smtp.ehlo_or_helo_if_needed = MagicMock()
+        smtp.login = MagicMock()
+        smtp.sendmail = MagicMock(return_value={})
+        with patch.object(emailer_module, '_open_smtp', return_value=smtp), \
+                patch.object(emailer_module, 'validate_email_config'), \
+                patch.object(emailer_module, '_append_email_log'):
+            yield smtp
+
+    def _send(self):
+        return emailer_module.send_email(
+            "IPO Reminder", "Price band ₹100-120\nSecond line", "<p>Price band ₹100-120</p>",
+            recipients=["recipient@example.com"]
+        )
+
+    def test_non_ascii_parts_are_sent_8bit(self, smtp):
+        """Non-ASCII text goes out 8bit with BODY=8BITMIME, not base64."""
+        assert self._send()
+
+        sender, recipients, data, mail_options = smtp.sendmail.call_args[0][:4]
+        assert recipients == ["recipient@example.com"]
+        assert 'BODY=8BITMIME' in mail_options
+        assert b'Content-Transfer-Encoding: 8bit' in data
+        assert b'base64' not in data
+        assert '₹100-120'.encode() in data
+
+    def test_payload_uses_crlf_line_endings(self, smtp):
+        """Every line of the DATA payload ends in CRLF, as RFC 5321 requires."""
+        assert self._send()
+
+        data = smtp.sendmail.call_args[0][2]
+        assert b'\r\n' in data
+        assert b'\n' not in data.replace(b'\r\n', b'')
+
+
+class TestSmtpSettings:
+    """Test cases for per-provider SMTP host, port and TLS mode."""
+
+    def test_ssl_flag_uses_implicit_tls_on_465(self, monkeypatch):
+        monkeypatch.setattr(emailer_module, 'SMTP_USE_SSL', True)
+
+        assert emailer_module._get_smtp_settings('me@gmail.com') == ('smtp.gmail.com', 465, True)
+
+    def test_outlook_keeps_starttls_with_ssl_flag(self, monkeypatch):
+        """Outlook only offers STARTTLS on 587, whatever SMTP_USE_SSL says."""
+        monkeypatch.setattr(emailer_module, 'SMTP_USE_SSL', True)
+        monkeypatch.delenv('SMTP_SERVER', raising=False)
+        monkeypatch.delenv('SMTP_PORT', raising=False)
+
+        assert emailer_module._get_smtp_settings('me@outlook.com') == ('smtp-mail.outlook.com', 587, False)
+        # The custom-server fallback defaults to Outlook too
+        assert emailer_module._get_smtp_settings('me@example.com') == ('smtp-mail.outlook.com', 587, False)
+
+    @pytest.mark.asyncio
+    async def test_async_outlook_connection_uses_starttls(self, monkeypatch):
+        monkeypatch.setattr(emailer_module, 'SMTP_USE_SSL', True)
+        client = _mock_smtp_client()
+        with patch.object(emailer_module.aiosmtplib, 'SMTP', return_value=client) as smtp:
+            transport = emailer_module.AsyncEmailer("sender@outlook.com", "secret")
+            await transport._ensure_connected()
+            await transport.close()
+
+        smtp.assert_called_once_with(
+            hostname='smtp-mail.outlook.com', port=587, use_tls=False, start_tls=False, timeout=30
+        )
+        client.starttls.assert_awaited_once()
+
+
+def _mock_smtp_client():
+    """An aiosmtplib.SMTP stand-in whose protocol methods are AsyncMocks."""
+    client = MagicMock(is_connected=True)
+    for name in ('connect', 'starttls', 'login', 'send_message', 'noop', 'quit'):
+        setattr(client, name, AsyncMock())
+    return client
+
+
+class TestAsyncEmailer:
+    """Test cases for the persistent AsyncEmailer connection."""
+
+    @pytest.fixture
+    def smtp(self):
+        """Patch aiosmtplib.SMTP to hand out a new mock client per connection."""
+        with patch.object(emailer_module.aiosmtplib, 'SMTP',
+                          side_effect=lambda **kwargs: _mock_smtp_client()) as smtp:
+            yield smtp
+
+    @pytest.fixture
+    def message(self):
+        return emailer_module._build_message(
+            "IPO Reminder", "Body", None, "sender@example.com", ["recipient@example.com"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_connection_is_reused(self, smtp, message):
+        """Sends share one connection, opened and authenticated once."""
+        transport = emailer_module.AsyncEmailer("sender@example.com", "secret")
+        await transport.send(message)
+        await transport.send(message)
+
+        assert smtp.call_count == 1
+        client = transport._client
+        client.login.assert_awaited_once_with("sender@example.com", "secret")
+        assert client.send_message.await_count == 2
+        await transport.close()
+
+    @pytest.mark.asyncio
+    async def test_sends_are_serialized(self, smtp, message):
+        """The lock keeps concurrent sends from interleaving on the connection."""
+        transport = emailer_module.AsyncEmailer("sender@example.com", "secret")
+        active = []
+        overlaps = []
+
+        async def send_message(msg):
+            overlaps.append(len(active))
+            active.append(msg)
+            await asyncio.sleep(0.01)
+            active.remove(msg)
+
+        await transport.send(message)
+        transport._client.send_message.side_effect = send_message
+        await asyncio.gather(*(transport.send(message) for _ in range(3)))
+
+        assert overlaps == [0, 0, 0]
+        await transport.close()
+
+    @pytest.mark.asyncio
+    async def test_reconnects_after_disconnect(self, smtp, message):
+        """A dropped connection is reopened and the message resent once."""
+        transport = emailer_module.AsyncEmailer("sender@example.com", "secret")
+        await transport.send(message)
+        dropped = transport._client
+        dropped.send_message.side_effect = aiosmtplib.SMTPServerDisconnected("gone")
+
+        await transport.send(message)
+
+        assert smtp.call_count == 2
+        assert transport._client is not dropped
+        transport._client.send_message.assert_awaited_once_with(message)
+        await transport.close()
+
+    @pytest.mark.asyncio
+    async def test_keepalive_sends_noop(self, smtp, message):
+        """Idle connections get NOOPs; a failed NOOP forces a reconnect on the next send."""
+        transport = emailer_module.AsyncEmailer("sender@example.com", "secret")
+        transport.KEEPALIVE_INTERVAL_SECONDS = 0.01
+        await transport.send(message)
+        client = transport._client
+
+        await asyncio.sleep(0.05)
+        assert client.noop.await_count >= 1
+
+        client.noop.side_effect = aiosmtplib.SMTPResponseException(421, "closing")
+        await asyncio.sleep(0.05)
+        assert transport._client is None
+
+        await transport.send(message)
+        assert smtp.call_count == 2
+        await transport.close()
+
+    @pytest.mark.asyncio
+    async def test_close(self, smtp, message):
+        """close() quits the session and stops the keep-alive task."""
+        transport = emailer_module.AsyncEmailer("sender@example.com", "secret")
+        await transport.send(message)
+        client = transport._client
+        keepalive = transport._keepalive_task
+
+        await transport.close()
+        await asyncio.sleep(0)
+
+        client.quit.assert_awaited_once()
+        assert transport._client is None
+        assert keepalive.cancelled()